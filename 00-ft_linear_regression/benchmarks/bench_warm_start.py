@@ -0,0 +1,51 @@
+# Retrain time saved by warm start and partial_fit when a few rows arrive.
+# Run from 00-ft_linear_regression: python benchmarks/bench_warm_start.py [rows] [features] [new_rows]
+import contextlib
+import io
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'srcs'))
+from LinearRegression import train, normalize_thetas, train_multivariate, partial_fit, predict_multivariate, read_dataset
+
+def timed(func, *args, **kwargs):
+	start = time.perf_counter()
+	result = func(*args, **kwargs)
+	return result, time.perf_counter() - start
+
+def bench_single_feature():
+	x, y = read_dataset('Dataset/data.csv')
+	old_x, old_y = x[:-4], y[:-4]
+	# quiet: train() prints every cycle
+	with contextlib.redirect_stdout(io.StringIO()):
+		(t0, t1, _), _ = timed(train, old_x, old_y, 0, 0, 0.01, 10000, False, 1e-7)
+		(_, _, cold_losses), cold = timed(train, x, y, 0, 0, 0.01, 10000, False, 1e-7)
+		(_, _, warm_losses), warm = timed(train, x, y, *normalize_thetas(t0, t1, x, y), 0.01, 10000, False, 1e-7)
+	print(f"train() on data.csv, {len(x) - len(old_x)} new rows:")
+	print(f"  cold start  {cold * 1e3:8.1f} ms  {len(cold_losses):6} cycles")
+	print(f"  warm start  {warm * 1e3:8.1f} ms  {len(warm_losses):6} cycles  ({cold / warm:.1f}x faster)")
+
+def bench_multivariate(m, n, new):
+	rng = np.random.default_rng(0)
+	X = rng.uniform(0, 100, (m + new, n))
+	y = X @ rng.normal(size=n) + 5 + rng.normal(size=m + new)
+	features = [f"f{i}" for i in range(n)]
+	old, _ = train_multivariate(X[:m], y[:m], features, method='gd')
+
+	print(f"train_multivariate, {m} rows x {n} features + {new} new rows:")
+	for method in ('gd', 'cholesky'):
+		(cold_model, cold_losses), cold = timed(train_multivariate, X, y, features, method=method)
+		(warm_model, warm_losses), warm = timed(train_multivariate, X, y, features, method=method, init=old)
+		(part_model, part_losses), part = timed(partial_fit, old, X[m:], y[m:], method=method)
+		gap = np.abs(predict_multivariate(X[:1000], part_model) - predict_multivariate(X[:1000], cold_model)).max()
+		print(f"  {method:<8} cold      {cold * 1e3:8.1f} ms  {len(cold_losses):6} cycles")
+		print(f"  {method:<8} warm      {warm * 1e3:8.1f} ms  {len(warm_losses):6} cycles  ({cold / warm:.1f}x faster)")
+		print(f"  {method:<8} partial   {part * 1e3:8.1f} ms  {len(part_losses):6} cycles  ({cold / part:.1f}x faster, max gap to cold {gap:.2e})")
+
+if __name__ == '__main__':
+	counts = [int(arg) for arg in sys.argv[1:]]
+	m, n, new = counts + [1_000_000, 20, 1000][len(counts):]
+	bench_single_feature()
+	bench_multivariate(m, n, new)
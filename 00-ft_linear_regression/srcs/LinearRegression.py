@@ -1,5 +1,8 @@
 from plotting import plot_data
+from profiler import profiler
+import numpy as np
 import pandas as pd
+import os
 
 def estimate_price(mileage, theta0, theta1):
 	return theta0 + (theta1 * mileage)
@@ -7,6 +10,30 @@ def estimate_price(mileage, theta0, theta1):
 def normalize(x):
 	return (x - x.min()) / (x.max() - x.min())
 
+# map thetas learned on min-max normalized x and y back to the original units
+def denormalize(theta0, theta1, x, y):
+	y_range = y.max() - y.min()
+	x_range = x.max() - x.min()
+	return theta0 * y_range + y.min() - theta1 * x.min() * y_range / x_range, theta1 * y_range / x_range
+
+# inverse of denormalize: saved thetas to the normalized space of x and y,
+# to warm-start train() from a previous model
+def normalize_thetas(theta0, theta1, x, y):
+	y_range = y.max() - y.min()
+	x_range = x.max() - x.min()
+	return (theta0 - y.min() + theta1 * x.min()) / y_range, theta1 * x_range / y_range
+
+def load_thetas(path='thetas.csv'):
+	theta0 = 0
+	theta1 = 0
+	# if exist file thetas.csv
+	if os.path.isfile(path):
+		with open(path, 'r') as f:
+			theta0, theta1 = f.read().split(',')
+			theta0 = float(theta0)
+			theta1 = float(theta1)
+	return theta0, theta1
+
 def cost_function(x, y, theta0, theta1):
 	m = len(x)
 	cost = 0
@@ -26,20 +53,59 @@ def gradient_descent(x, y, theta0, theta1, lr):
 	theta1 -= (lr / m) * tmp1
 	return theta0, theta1
 
-def train(x, y, theta0, theta1, lr, n_cycle, plot, convergence_threshold=1e-6):
+CHECKPOINT = 'checkpoint.npz'
+
+# Normalized thetas, next iteration and losses of a train() in progress,
+# written to a temporary file then renamed so a kill never leaves half a
+# checkpoint. config identifies the run (lr, cycles, data) it belongs to
+def save_checkpoint(config, iteration, theta0, theta1, losses, path=CHECKPOINT):
+	with open(path + '.tmp', 'wb') as f:
+		np.savez(f, config=np.array(config), iteration=iteration, theta0=theta0, theta1=theta1, losses=np.asarray(losses))
+	os.replace(path + '.tmp', path)
+
+# (iteration, theta0, theta1, losses), or None if there is no checkpoint of this run
+def load_checkpoint(config, path=CHECKPOINT):
+	if not os.path.isfile(path):
+		print("No checkpoint found, training from the start.")
+		return None
+	with np.load(path) as data:
+		if str(data['config']) != config:
+			print("The checkpoint was saved with other data or settings, training from the start.")
+			return None
+		return int(data['iteration']), float(data['theta0']), float(data['theta1']), data['losses'].tolist()
+
+# With checkpoint_every, checkpoint.npz is saved every checkpoint_every
+# iterations; resume continues from it with the same steps as an
+# uninterrupted run
+def train(x, y, theta0, theta1, lr, n_cycle, plot, convergence_threshold=1e-6, checkpoint_every=None, resume=False):
 	m = len(x)
 	x_norm = normalize(x)
 	y_norm = normalize(y)
 	losses = []
 	cost_prev = float('inf')
+	config = str((lr, n_cycle, convergence_threshold, m, float(x.sum()), float(y.sum())))
+	start = 0
+	state = load_checkpoint(config) if resume else None
+	# the checkpoint is this run's once resumed from or written, only then
+	# is it removed at the end; another run's stays resumable
+	owned = state is not None
+	if state is not None:
+		start, theta0, theta1, losses = state
+		cost_prev = losses[-1] if losses else float('inf')
+		print(f"Resuming from iteration {start}.")
 
-	for i in range(n_cycle):
-		theta0, theta1 = gradient_descent(x_norm, y_norm, theta0, theta1, lr)
+	for i in range(start, n_cycle):
+		with profiler.section("gd_step"):
+			theta0, theta1 = gradient_descent(x_norm, y_norm, theta0, theta1, lr)
 
-		cost = cost_function(x_norm, y_norm, theta0, theta1)
-		print("{}: theta0: {}, theta1: {}, cost: {}".format(i, theta0, theta1, cost))
+		with profiler.section("metrics"):
+			cost = cost_function(x_norm, y_norm, theta0, theta1)
+		with profiler.section("log"):
+			print("{}: theta0: {}, theta1: {}, cost: {}".format(i, theta0, theta1, cost))
 		if plot:
-			plot_data(x, y, theta0 * (y.max() - y.min()) + y.min() - theta1 * x.min() * (y.max() - y.min()) / (x.max() - x.min()), theta1 * (y.max() - y.min()) / (x.max() - x.min()), "during_training")
+			with profiler.section("plot"):
+				plot_data(x, y, *denormalize(theta0, theta1, x, y), "during_training")
+		profiler.count("gd_iterations")
 		# Check for convergence
 		if abs(cost_prev - cost) < convergence_threshold:
 			print("Converged. Stopping training.")
@@ -47,11 +113,185 @@ def train(x, y, theta0, theta1, lr, n_cycle, plot, convergence_threshold=1e-6):
 
 		cost_prev = cost
 		losses.append(cost)
+		if checkpoint_every and (i + 1) % checkpoint_every == 0:
+			with profiler.section("checkpoint"):
+				save_checkpoint(config, i + 1, theta0, theta1, losses)
+			owned = True
 
-	theta0 = theta0 * (y.max() - y.min()) + y.min() - theta1 * x.min() * (y.max() - y.min()) / (x.max() - x.min())
-	theta1 = theta1 * (y.max() - y.min()) / (x.max() - x.min())
+	if owned and os.path.isfile(CHECKPOINT):
+		os.remove(CHECKPOINT)
+	theta0, theta1 = denormalize(theta0, theta1, x, y)
 	return theta0, theta1, losses
 
 def read_dataset(path):
-	df = pd.read_csv(path).astype(float)
-	return df.iloc[:, 0].values, df.iloc[:, 1].values
\ No newline at end of file
+	with profiler.section("load"):
+		df = pd.read_csv(path).astype(float)
+	profiler.count("rows", len(df))
+	return df.iloc[:, 0].values, df.iloc[:, 1].values
+
+
+# Multivariate regression: price = theta[0] + X @ theta[1:]
+# X is (m, n), features are min-max scaled and the scaling is stored in the
+# model so predictions can be made on raw feature values.
+
+def fit_scaling(X):
+	x_min = X.min(axis=0)
+	x_range = X.max(axis=0) - x_min
+	x_range[x_range == 0] = 1 # constant feature, leave it unscaled
+	return x_min, x_range
+
+def scale(X, x_min, x_range):
+	X = np.asarray(X, dtype=np.float64)
+	return (X - x_min) / x_range
+
+# Augmented gram matrix [1 X]^T [1 X] and [1 X]^T y without building [1 X]
+def normal_terms(X, y):
+	m, n = X.shape
+	col_sums = X.sum(axis=0)
+	gram = np.empty((n + 1, n + 1))
+	gram[0, 0] = m
+	gram[0, 1:] = col_sums
+	gram[1:, 0] = col_sums
+	gram[1:, 1:] = X.T @ X
+	xty = np.concatenate(([y.sum()], X.T @ y))
+	return gram, xty
+
+def solve_least_squares(gram, xty):
+	try:
+		L = np.linalg.cholesky(gram)
+		return np.linalg.solve(L.T, np.linalg.solve(L, xty))
+	except np.linalg.LinAlgError:
+		# collinear features, gram is only semi-definite
+		return np.linalg.lstsq(gram, xty, rcond=None)[0]
+
+# Full-batch GD on the gram matrix: after one pass over X, every iteration
+# costs O(n^2) whatever the number of rows
+def batch_gradient_descent(gram, xty, yty, m, lr, n_cycle, convergence_threshold, theta=None):
+	theta = np.zeros(len(xty)) if theta is None else theta.copy()
+	g_theta = gram @ theta
+	losses = []
+	cost_prev = float('inf')
+	for i in range(n_cycle):
+		theta -= (lr / m) * (g_theta - xty)
+		g_theta = gram @ theta
+		cost = (theta @ g_theta - 2 * theta @ xty + yty) / (2 * m)
+		if abs(cost_prev - cost) < convergence_threshold:
+			break
+		cost_prev = cost
+		losses.append(cost)
+	return theta, losses
+
+def minibatch_gradient_descent(X, y, lr, n_epoch, batch_size, convergence_threshold, seed=42, theta=None):
+	m, n = X.shape
+	rng = np.random.default_rng(seed)
+	theta = np.zeros(n + 1) if theta is None else theta.copy()
+	losses = []
+	cost_prev = float('inf')
+	for epoch in range(n_epoch):
+		order = rng.permutation(m)
+		for start in range(0, m, batch_size):
+			idx = order[start:start + batch_size]
+			X_b = X[idx]
+			error = X_b @ theta[1:] + theta[0] - y[idx]
+			theta[0] -= lr * error.mean()
+			theta[1:] -= (lr / len(idx)) * (X_b.T @ error)
+		error = X @ theta[1:] + theta[0] - y
+		cost = (error @ error) / (2 * m)
+		if abs(cost_prev - cost) < convergence_threshold:
+			break
+		cost_prev = cost
+		losses.append(cost)
+	return theta, losses
+
+# method: 'gd' (full batch), 'minibatch' or 'cholesky' (closed form).
+# Without lr the GD step is 1 / L, L being the largest eigenvalue of the
+# scaled gram matrix, which converges for any number of features.
+# With init (a saved model) its scaling is reused and GD starts from its theta.
+def train_multivariate(X, y, features, target='price', method='cholesky', lr=None, n_cycle=10000, batch_size=1024, convergence_threshold=1e-12, init=None):
+	if method not in ('gd', 'minibatch', 'cholesky'):
+		raise ValueError(f"unknown method {method}, expected gd, minibatch or cholesky")
+	X = np.asarray(X, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+	if init:
+		x_min, x_range, y_min, y_range = init['x_min'], init['x_range'], init['y_min'], init['y_range']
+	else:
+		x_min, x_range = fit_scaling(X)
+		y_min = y.min()
+		y_range = (y.max() - y_min) or 1.0
+	model = {'features': list(features), 'target': target, 'x_min': x_min, 'x_range': x_range,
+		'y_min': y_min, 'y_range': y_range, 'theta': init['theta'] if init else None,
+		'gram': None, 'xty': None, 'yty': 0.0, 'm': 0}
+	return update_multivariate(model, X, y, method, lr, n_cycle, batch_size, convergence_threshold)
+
+# Incremental training: only the new rows are read. The model keeps the
+# normal-equation sums (gram, X^T y, y^T y, m) of every row seen so far, so
+# cholesky gives the exact fit of old + new data and GD warm-starts from
+# the current theta on those same sums. features, when given, are the
+# columns of X and must be the model's.
+def partial_fit(model, X, y, method='cholesky', lr=None, n_cycle=10000, batch_size=1024, convergence_threshold=1e-12, features=None):
+	if model['gram'] is None:
+		raise ValueError("the model has no saved sums (model_stats.npz), retrain it on all the rows or use --warm-start")
+	if features is not None and list(features) != model['features']:
+		raise ValueError(f"the new rows have the features {list(features)}, the model was trained on {model['features']}")
+	X = np.asarray(X, dtype=np.float64)
+	y = np.asarray(y, dtype=np.float64)
+	if X.shape[1] != len(model['features']):
+		raise ValueError(f"the new rows have {X.shape[1]} features, the model was trained on {len(model['features'])}")
+	return update_multivariate(dict(model), X, y, method, lr, n_cycle, batch_size, convergence_threshold)
+
+def update_multivariate(model, X, y, method, lr, n_cycle, batch_size, convergence_threshold):
+	X_norm = scale(X, model['x_min'], model['x_range'])
+	y_norm = (y - model['y_min']) / model['y_range']
+	gram, xty = normal_terms(X_norm, y_norm)
+	if model['gram'] is not None:
+		gram += model['gram']
+		xty += model['xty']
+	model['gram'], model['xty'] = gram, xty
+	model['yty'] = model['yty'] + y_norm @ y_norm
+	model['m'] = m = model['m'] + len(y_norm)
+
+	if lr is None:
+		lr = 1 / np.linalg.eigvalsh(gram / m)[-1]
+	losses = []
+	if method == 'cholesky':
+		model['theta'] = solve_least_squares(gram, xty)
+	elif method == 'gd':
+		model['theta'], losses = batch_gradient_descent(gram, xty, model['yty'], m, lr, n_cycle, convergence_threshold, model['theta'])
+	else:
+		# mini-batches can only walk over the rows at hand
+		model['theta'], losses = minibatch_gradient_descent(X_norm, y_norm, lr, n_cycle, batch_size, convergence_threshold, theta=model['theta'])
+	return model, losses
+
+def predict_multivariate(X, model):
+	X_norm = scale(X, model['x_min'], model['x_range'])
+	return (X_norm @ model['theta'][1:] + model['theta'][0]) * model['y_range'] + model['y_min']
+
+# model.csv: one row per feature with its scaling and theta, the intercept
+# first and the target (with its scaling) last. The normal-equation sums
+# used by partial_fit go next to it in model_stats.npz.
+def stats_path(path):
+	return os.path.splitext(path)[0] + '_stats.npz'
+
+def save_model(model, path='model.csv'):
+	with open(path, 'w') as f:
+		f.write("name,min,range,theta\n")
+		f.write(f"intercept,0.0,1.0,{float(model['theta'][0])!r}\n")
+		for name, x_min, x_range, theta in zip(model['features'], model['x_min'], model['x_range'], model['theta'][1:]):
+			f.write(f"{name},{float(x_min)!r},{float(x_range)!r},{float(theta)!r}\n")
+		f.write(f"{model['target']},{float(model['y_min'])!r},{float(model['y_range'])!r},\n")
+	if model.get('gram') is not None:
+		np.savez(stats_path(path), gram=model['gram'], xty=model['xty'], yty=model['yty'], m=model['m'])
+
+def load_model(path='model.csv'):
+	df = pd.read_csv(path)
+	features = df.iloc[1:-1]
+	model = {'features': features['name'].tolist(), 'target': df['name'].iloc[-1],
+		'x_min': features['min'].to_numpy(dtype=np.float64),
+		'x_range': features['range'].to_numpy(dtype=np.float64),
+		'y_min': float(df['min'].iloc[-1]), 'y_range': float(df['range'].iloc[-1]),
+		'theta': df['theta'].iloc[:-1].to_numpy(dtype=np.float64),
+		'gram': None, 'xty': None, 'yty': 0.0, 'm': 0}
+	if os.path.isfile(stats_path(path)):
+		with np.load(stats_path(path)) as stats:
+			model.update(gram=stats['gram'], xty=stats['xty'], yty=float(stats['yty']), m=int(stats['m']))
+	return model
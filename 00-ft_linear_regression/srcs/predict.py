@@ -1,18 +1,105 @@
-import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from LinearRegression import load_model, load_thetas, predict_multivariate
+
+USAGE = ("Usage: python srcs/predict.py [--batch input|- [output|-] [--binary] [--no-header] [--chunksize N] "
+	"[--model model.csv]]")
 
 def estimate_price(mileage, theta0, theta1):
 	return theta0 + (theta1 * mileage)
 
+# Feature rows in chunks: a CSV (with header) read by column name, or its
+# first column when no names are given; with header=False a CSV without
+# header whose first columns are the features in order; or with binary=True
+# a raw stream of little-endian float64 values, n_cols per row
+def read_rows(path, chunksize, binary, columns=None, header=True):
+	n_cols = len(columns) if columns else 1
+	if not binary:
+		source = sys.stdin if path == '-' else path
+		usecols = (columns or [0]) if header else list(range(n_cols))
+		for chunk in pd.read_csv(source, usecols=usecols, header=0 if header else None, chunksize=chunksize):
+			rows = chunk[usecols] if columns else chunk.iloc[:, 0]
+			yield rows.to_numpy(dtype=np.float64)
+		return
+	f = sys.stdin.buffer if path == '-' else open(path, 'rb')
+	try:
+		while True:
+			buf = f.read(chunksize * 8 * n_cols)
+			if not buf:
+				break
+			if len(buf) % (8 * n_cols):
+				raise ValueError("binary input is not a whole number of float64 rows")
+			values = np.frombuffer(buf, dtype='<f8')
+			yield values.reshape(-1, n_cols) if columns else values
+	finally:
+		if f is not sys.stdin.buffer:
+			f.close()
+
+def write_prices(out, prices, binary, header):
+	if binary:
+		out.write(prices.astype('<f8', copy=False).tobytes())
+	else:
+		# repr keeps full float precision and is faster than DataFrame.to_csv
+		if header:
+			out.write("price\n")
+		out.write("\n".join(map(repr, prices.tolist())))
+		out.write("\n")
+
+def predict_batch(input_path, output_path, binary=False, chunksize=1_000_000, model_path=None, header=True):
+	model = load_model(model_path) if model_path else None
+	theta0, theta1 = load_thetas()
+	mode = 'wb' if binary else 'w'
+	if output_path == '-':
+		out = sys.stdout.buffer if binary else sys.stdout
+	else:
+		out = open(output_path, mode, buffering=1 << 20)
+	rows = 0
+	start = time.perf_counter()
+	try:
+		for chunk in read_rows(input_path, chunksize, binary, model['features'] if model else None, header):
+			if model:
+				prices = predict_multivariate(chunk, model)
+			else:
+				# one output buffer per chunk, no intermediate temporaries
+				prices = np.multiply(chunk, theta1)
+				prices += theta0
+			write_prices(out, prices, binary, header=header and rows == 0)
+			rows += len(prices)
+	finally:
+		if output_path != '-':
+			out.close()
+		else:
+			out.flush()
+	elapsed = time.perf_counter() - start
+	print(f"Predicted {rows} prices in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)", file=sys.stderr)
+
+def main():
+	args = sys.argv[1:]
+	if not args:
+		theta0, theta1 = load_thetas()
+		mileage = float(input("Enter mileage: "))
+		print(estimate_price(mileage, theta0, theta1))
+		return
+
+	binary = '--binary' in args
+	header = '--no-header' not in args
+	options = {'--chunksize': 1_000_000, '--model': None}
+	args = [arg for arg in args if arg not in ('--binary', '--no-header')]
+	for option in options:
+		if option in args:
+			i = args.index(option)
+			if i + 1 == len(args):
+				print(USAGE)
+				sys.exit(1)
+			options[option] = args[i + 1]
+			del args[i:i + 2]
+	if not args or args[0] != '--batch' or len(args) not in (2, 3):
+		print(USAGE)
+		sys.exit(1)
+	predict_batch(args[1], args[2] if len(args) == 3 else '-', binary,
+		int(options['--chunksize']), options['--model'], header)
 
 if __name__ == '__main__':
-	theta0 = 0
-	theta1 = 0
-	mileage = 0
-	# if exist file thetas.csv
-	if os.path.isfile('thetas.csv'):
-		with open('thetas.csv', 'r') as f:
-			theta0, theta1 = f.read().split(',')
-			theta0 = float(theta0)
-			theta1 = float(theta1)
-	mileage = float(input("Enter mileage: "))
-	print(estimate_price(mileage, theta0, theta1))
\ No newline at end of file
+	main()
@@ -0,0 +1,79 @@
+# Opt-in instrumentation behind --profile: wall time and call count per named
+# section, free-form counters and the process peak memory, written as JSON.
+# With --cprofile a cProfile dump is written too (python -m pstats file.prof).
+# When disabled, section() returns one shared no-op context so the hot loops
+# pay next to nothing for being instrumented.
+import cProfile
+import json
+import resource
+import sys
+import time
+from contextlib import nullcontext
+
+class Section:
+	def __init__(self, stats):
+		self.stats = stats
+
+	def __enter__(self):
+		self.start = time.perf_counter()
+
+	def __exit__(self, *exc):
+		self.stats[0] += 1
+		self.stats[1] += time.perf_counter() - self.start
+
+class Profiler:
+	def __init__(self):
+		self.enabled = False
+		self.sections = {}
+		self.counters = {}
+		self._null = nullcontext()
+
+	def section(self, name):
+		if not self.enabled:
+			return self._null
+		return Section(self.sections.setdefault(name, [0, 0.0]))
+
+	def count(self, name, n=1):
+		if self.enabled:
+			self.counters[name] = self.counters.get(name, 0) + n
+
+	# ru_maxrss is in kilobytes on Linux and in bytes on macOS
+	def peak_memory_mb(self):
+		peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+		return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+	def report(self, wall_time):
+		return {
+			"command": " ".join(sys.argv),
+			"wall_time_s": wall_time,
+			"peak_memory_mb": self.peak_memory_mb(),
+			"sections": {
+				section: {"calls": calls, "total_s": total, "mean_ms": total / calls * 1000}
+				for section, (calls, total) in sorted(self.sections.items(), key=lambda item: -item[1][1])
+			},
+			"counters": self.counters,
+		}
+
+	# Runs main, profiled only if enabled; the report goes to
+	# profile_<name>.json and the cProfile dump to profile_<name>.prof
+	def run(self, main, name, enabled=False, cprofile=False):
+		self.enabled = enabled or cprofile
+		if not self.enabled:
+			return main()
+		profile = cProfile.Profile() if cprofile else None
+		start = time.perf_counter()
+		try:
+			if profile:
+				return profile.runcall(main)
+			return main()
+		finally:
+			wall_time = time.perf_counter() - start
+			with open(f"profile_{name}.json", "w") as f:
+				json.dump(self.report(wall_time), f, indent=4)
+			message = f"Profile saved in profile_{name}.json"
+			if profile:
+				profile.dump_stats(f"profile_{name}.prof")
+				message += f" and profile_{name}.prof"
+			print(message, file=sys.stderr)
+
+profiler = Profiler()
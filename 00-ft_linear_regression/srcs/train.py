@@ -1,7 +1,8 @@
 import sys
 from plotting import plot_data, plot_loss, plot_precision
 from precision import precision
-from LinearRegression import train, read_dataset
+from LinearRegression import train, read_dataset, load_thetas, normalize_thetas
+from profiler import profiler
 
 
 
@@ -21,21 +22,34 @@ def main():
 	theta1 = 0
 	lr = 0.01
 	n_cycle = 10000
-	plot = True if len(sys.argv) == 2 and sys.argv[1] == '--plot' else False
+	plot = '--plot' in sys.argv
+	# checkpoint.npz every N iterations (--checkpoint N, 0 to disable),
+	# --resume continues from it
+	checkpoint_every = int(sys.argv[sys.argv.index('--checkpoint') + 1]) if '--checkpoint' in sys.argv else 1000
+	resume = '--resume' in sys.argv
+	# warm start: continue from the saved thetas.csv instead of zero
+	warm_start = '--warm-start' in sys.argv
+	if warm_start:
+		theta0, theta1 = load_thetas()
 	if plot:
-		plot_data(x, y, theta0, theta1, "before_training")
-	theta0, theta1, losses = train(x, y, theta0, theta1, lr, n_cycle, plot, convergence_threshold=1e-7)
-	save_model(theta0, theta1)
+		with profiler.section("plot"):
+			plot_data(x, y, theta0, theta1, "before_training")
+	theta0, theta1 = normalize_thetas(theta0, theta1, x, y) if warm_start else (theta0, theta1)
+	theta0, theta1, losses = train(x, y, theta0, theta1, lr, n_cycle, plot, convergence_threshold=1e-7,
+		checkpoint_every=checkpoint_every, resume=resume)
+	with profiler.section("save"):
+		save_model(theta0, theta1)
 	print("theta0: ", theta0)
 	print("theta1: ", theta1)
 	y_hat = theta0 + theta1 * x
 	if plot:
 		# Optionally plot data here
-		plot_data(x, y, theta0, theta1, "training")
-		plot_precision(x, y, y_hat, precision(y, y_hat) * 100)
-		plot_loss(losses)
+		with profiler.section("plot"):
+			plot_data(x, y, theta0, theta1, "training")
+			plot_precision(x, y, y_hat, precision(y, y_hat) * 100)
+			plot_loss(losses)
 		prec = precision(y, y_hat) * 100
 		print(f"Precision: {prec:.2f}%")
 
 if __name__ == '__main__':
-	main()
+	profiler.run(main, "train", '--profile' in sys.argv, '--cprofile' in sys.argv)
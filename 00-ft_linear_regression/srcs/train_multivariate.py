@@ -0,0 +1,63 @@
+import sys
+import time
+import pandas as pd
+from precision import precision
+from LinearRegression import train_multivariate, partial_fit, predict_multivariate, save_model, load_model
+
+USAGE = "Usage: python srcs/train_multivariate.py path/to/data.csv [--target price] [--method cholesky|gd|minibatch] [--lr LR] [--cycles N] [--batch-size N] [--warm-start | --partial]"
+FLAGS = ('--warm-start', '--partial')
+
+def parse_args(argv):
+	if not argv or argv[0].startswith('--'):
+		print(USAGE)
+		sys.exit(1)
+	options = {'--target': 'price', '--method': 'cholesky', '--lr': None, '--cycles': '10000', '--batch-size': '1024'}
+	args = [arg for arg in argv[1:] if arg not in FLAGS]
+	options.update({flag: flag in argv for flag in FLAGS})
+	for i in range(0, len(args), 2):
+		if args[i] not in options or i + 1 >= len(args):
+			print(USAGE)
+			sys.exit(1)
+		options[args[i]] = args[i + 1]
+	return argv[0], options
+
+def main():
+	path, options = parse_args(sys.argv[1:])
+	target = options['--target']
+	df = pd.read_csv(path)
+	# every numeric column but the target is a feature
+	features = [col for col in df.select_dtypes(include='number').columns if col != target]
+	X = df[features].to_numpy(dtype=float)
+	y = df[target].to_numpy(dtype=float)
+
+	lr = float(options['--lr']) if options['--lr'] else None
+	start = time.perf_counter()
+	try:
+		if options['--partial']:
+			# the csv only holds the new rows, model.csv already has the old ones
+			model, losses = partial_fit(load_model(), X, y, method=options['--method'], lr=lr,
+				n_cycle=int(options['--cycles']), batch_size=int(options['--batch-size']), features=features)
+		else:
+			model, losses = train_multivariate(X, y, features, target=target, method=options['--method'],
+				lr=lr, n_cycle=int(options['--cycles']), batch_size=int(options['--batch-size']),
+				init=load_model() if options['--warm-start'] else None)
+	except ValueError as e:
+		print(f"Error: {e}")
+		sys.exit(1)
+	elapsed = time.perf_counter() - start
+	save_model(model)
+
+	print(f"Trained on {X.shape[0]} {'new ' if options['--partial'] else ''}rows x {X.shape[1]} features with {options['--method']} in {elapsed:.3f}s"
+		+ (f" ({len(losses)} cycles)" if losses else ""))
+	# thetas in original units, for reading: price = intercept + sum(theta * feature)
+	weights = model['theta'][1:] * model['y_range'] / model['x_range']
+	intercept = model['theta'][0] * model['y_range'] + model['y_min'] - weights @ model['x_min']
+	print(f"intercept: {intercept}")
+	for name, weight in zip(features, weights):
+		print(f"{name}: {weight}")
+	y_hat = predict_multivariate(X, model)
+	print(f"Precision: {precision(y, y_hat) * 100:.2f}%")
+	print("Model saved in model.csv")
+
+if __name__ == '__main__':
+	main()
@@ -0,0 +1,35 @@
+# Training on one-hot encoded string features (first name, last name,
+# birthday, best hand) as a CSR sparse matrix against the same matrix dense.
+# Run from 01-dslr: python benchmarks/bench_categorical.py [path/to/dataset_train.csv] [num_iter]
+import sys
+import time
+import numpy as np
+
+from common import SELECTED_FEATURES, STRING_FEATURES, train_all
+from LogisticRegression import LogisticRegression
+from Dataset import Dataset
+
+def main():
+	path = sys.argv[1] if len(sys.argv) > 1 else "Dataset/dataset_train.csv"
+	num_iter = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+	start = time.perf_counter()
+	dataset = Dataset(path, encoding="onehot")
+	dataset.select_features(SELECTED_FEATURES + STRING_FEATURES)
+	mapping = dataset.prepare_data()
+	X, y = dataset.get_data()
+	print(f"loaded and encoded in {time.perf_counter() - start:.2f}s: {X.shape[0]} students x {X.shape[1]} columns, "
+		f"{len(X.data)} stored values")
+
+	results = {}
+	for name, matrix in (("sparse", X), ("dense", X.toarray())):
+		model = LogisticRegression(mapping=mapping, lr=0.003, num_iter=num_iter)
+		thetas, elapsed, _ = train_all(model, matrix, y)
+		size = matrix.nbytes if name == "dense" else matrix.data.nbytes + matrix.indices.nbytes + matrix.indptr.nbytes
+		results[name] = thetas
+		print(f"  {name:6}: {elapsed:6.2f}s for {num_iter} iterations per class, X takes {size / 2**20:7.2f} MiB, "
+			f"accuracy {np.mean(model.predict(matrix) == y):.4f}")
+	difference = max(np.max(np.abs(a - b)) for a, b in zip(results["sparse"], results["dense"]))
+	print(f"  largest theta difference: {difference:.2e}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,35 @@
+# Training speed and accuracy of float32 against float64.
+# Run from 01-dslr: python benchmarks/bench_dtype.py [path/to/dataset_train.csv] [copies] [num_iter]
+# The training rows are repeated `copies` times so the matrix no longer fits
+# in cache and the loop is bound by memory bandwidth, as on a big dataset.
+import sys
+import numpy as np
+
+from common import SELECTED_FEATURES, train_all
+from LogisticRegression import LogisticRegression
+from Dataset import Dataset
+
+def main():
+	path = sys.argv[1] if len(sys.argv) > 1 else "Dataset/dataset_train.csv"
+	copies = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+	num_iter = int(sys.argv[3]) if len(sys.argv) > 3 else 1000
+	results = {}
+	for dtype in (np.float64, np.float32):
+		dataset = Dataset(path)
+		dataset.select_features(list(SELECTED_FEATURES))
+		mapping = dataset.prepare_data(dtype)
+		X, y = dataset.get_data()
+		X, y = np.tile(X, (copies, 1)), np.tile(y, copies)
+		model = LogisticRegression(mapping=mapping, lr=0.003, num_iter=num_iter, dtype=dtype)
+		thetas, elapsed, _ = train_all(model, X, y)
+		results[dtype] = (thetas, elapsed, np.mean(model.predict(X) == y), X.nbytes)
+
+	print(f"{len(y)} students x {len(SELECTED_FEATURES)} features, {num_iter} iterations per class:")
+	base_thetas, base_time, _, _ = results[np.float64]
+	for dtype, (thetas, elapsed, acc, nbytes) in results.items():
+		drift = max(np.max(np.abs(np.asarray(t, dtype=np.float64) - b)) for t, b in zip(thetas, base_thetas))
+		print(f"  {np.dtype(dtype).name:8} {elapsed:7.2f}s  X {nbytes / 2**20:6.1f} MB  accuracy {acc:.4f}  "
+			f"max theta diff {drift:.2e}  ({base_time / elapsed:.2f}x)")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,69 @@
+# Iterations (GD) or epochs (SGD) each optimizer and schedule needs to reach
+# the held-out accuracy, and the training cost, of the default 20,000-iteration
+# gradient descent.
+# Run from 01-dslr: python benchmarks/bench_optimizers.py [path/to/dataset_train.csv]
+# Every configuration is trained with budgets 1, 2, 4, ... until it reaches
+# both, without saving anything.
+import sys
+import numpy as np
+
+from common import SELECTED_FEATURES, train_all
+from LogisticRegression import LogisticRegression
+from Dataset import Dataset
+
+# (label, stochastic, optimizer, schedule, lr)
+CONFIGS = [
+	("GD", False, "gd", None, 0.003),
+	("GD momentum", False, "momentum", None, 0.003),
+	("GD nesterov", False, "nesterov", None, 0.003),
+	("GD adam", False, "adam", None, 0.05),
+	("GD adam cosine", False, "adam", "cosine", 0.1),
+	("GD line search", False, "line_search", None, 10.0),
+	("SGD", True, "gd", None, 0.005),
+	("SGD inverse time", True, "gd", "inverse_time", 0.05),
+	("SGD step", True, "gd", "step", 0.05),
+	("SGD adam cosine", True, "adam", "cosine", 0.01),
+	("SGD line search", True, "line_search", None, 1.0),
+]
+
+def train(mapping, X, y, stochastic, optimizer, schedule, lr, num_iter):
+	model = LogisticRegression(mapping=mapping, lr=lr, num_iter=num_iter, optimizer=optimizer, schedule=schedule)
+	np.random.seed(42)
+	_, elapsed, _ = train_all(model, X, y, stochastic)
+	return model, elapsed
+
+# Mean one-vs-all training cost over the houses
+def mean_cost(model, X, y):
+	return np.mean([model.cost_function(X, np.where(y == label, 1, 0), theta)
+		for label, theta in zip(model.unique_labels, model.tetha_values)])
+
+def main():
+	path = sys.argv[1] if len(sys.argv) > 1 else "Dataset/dataset_train.csv"
+	np.random.seed(42)
+	dataset = Dataset(path)
+	dataset.select_features(list(SELECTED_FEATURES))
+	mapping = dataset.prepare_data()
+	X_train, X_test, y_train, y_test = dataset.get_train_test_data(test_size=0.2)
+
+	baseline, baseline_time = train(mapping, X_train, y_train, False, "gd", None, 0.003, 20000)
+	target = np.mean(baseline.predict(X_test) == y_test)
+	target_cost = mean_cost(baseline, X_train, y_train)
+	print(f"baseline GD, 20000 iterations in {baseline_time:.2f}s: accuracy {target:.4f}, training cost {target_cost:.4f}")
+	print(f"  {'':18} {'':9} {'to reach the accuracy':>28}   {'to reach the cost':>24}")
+	for label, stochastic, optimizer, schedule, lr in CONFIGS:
+		budget = 1
+		limit = 256 if stochastic else 32768
+		reached = {}
+		while len(reached) < 2 and budget <= limit:
+			model, elapsed = train(mapping, X_train, y_train, stochastic, optimizer, schedule, lr, budget)
+			if "accuracy" not in reached and np.mean(model.predict(X_test) == y_test) >= target:
+				reached["accuracy"] = f"{budget:6} {elapsed:6.2f}s"
+			if "cost" not in reached and mean_cost(model, X_train, y_train) <= target_cost:
+				reached["cost"] = f"{budget:6} {elapsed:6.2f}s"
+			budget *= 2
+		unit = "epochs" if stochastic else "iterations"
+		print(f"  {label:18} lr {lr:<6} {unit:>10} {reached.get('accuracy', 'not reached'):>17}   "
+			f"{reached.get('cost', 'not reached'):>24}")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,86 @@
+# N concurrent trainings on one dataset: every worker loading and preparing
+# the CSV itself, against workers attached to one copy in shared memory.
+# Run from 01-dslr: python benchmarks/bench_shared.py [path/to/dataset_train.csv] [copies] [workers]
+# The training rows are repeated `copies` times into a temporary CSV so the
+# data dominate the memory of a worker. Private memory (Linux only) is read
+# from /proc/self/smaps_rollup at the end of each worker.
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+
+from common import SELECTED_FEATURES, train_all
+from LogisticRegression import LogisticRegression
+from Dataset import Dataset
+
+NUM_ITER = 20
+
+def private_mb():
+	try:
+		with open("/proc/self/smaps_rollup") as f:
+			fields = dict(line.split()[:2] for line in f if line.startswith("Private"))
+	except OSError:
+		return float("nan")
+	return sum(int(kb) for kb in fields.values()) / 1024
+
+def fit(X, y, mapping):
+	train_all(LogisticRegression(mapping=mapping, lr=0.003, num_iter=NUM_ITER), X, y)
+
+# Each worker parses the CSV and holds its own X
+def parse_worker(path):
+	start = time.perf_counter()
+	dataset = Dataset(path)
+	dataset.select_features(list(SELECTED_FEATURES))
+	mapping = dataset.prepare_data()
+	X, y = dataset.get_data()
+	ready = time.perf_counter() - start
+	fit(X, y, mapping)
+	return ready, private_mb()
+
+# Each worker maps the parent's X read-only
+def shared_worker(shared, mapping):
+	start = time.perf_counter()
+	X, y = shared.get_data()
+	ready = time.perf_counter() - start
+	fit(X, y, mapping)
+	return ready, private_mb()
+
+def run(executor, submit, workers):
+	start = time.perf_counter()
+	results = [future.result() for future in [submit(executor) for _ in range(workers)]]
+	ready, memory = np.array(results).T
+	return time.perf_counter() - start, ready.mean(), memory.mean()
+
+def main():
+	path = sys.argv[1] if len(sys.argv) > 1 else "Dataset/dataset_train.csv"
+	copies = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+	workers = int(sys.argv[3]) if len(sys.argv) > 3 else 4
+	with tempfile.TemporaryDirectory() as tmp:
+		big = os.path.join(tmp, "train.csv")
+		pd.concat([pd.read_csv(path)] * copies).to_csv(big, index=False)
+		with ProcessPoolExecutor(workers) as executor:
+			# start the workers before timing
+			list(executor.map(abs, range(workers)))
+			parsed = run(executor, lambda e: e.submit(parse_worker, big), workers)
+
+			start = time.perf_counter()
+			dataset = Dataset(big)
+			dataset.select_features(list(SELECTED_FEATURES))
+			mapping = dataset.prepare_data()
+			with dataset.share() as shared:
+				publish = time.perf_counter() - start
+				attached = run(executor, lambda e: e.submit(shared_worker, shared, mapping), workers)
+		size = dataset.x.nbytes + dataset.y.nbytes
+
+	print(f"{len(dataset.y)} students x {len(SELECTED_FEATURES)} features ({size / 2**20:.1f} MiB), "
+		f"{workers} workers x {NUM_ITER} GD iterations per class:")
+	print(f"  each worker parses the CSV: {parsed[0]:6.2f}s, data ready in {parsed[1]:6.3f}s per worker, "
+		f"{parsed[2]:7.1f} MiB private per worker")
+	print(f"  shared memory             : {publish + attached[0]:6.2f}s ({publish:.2f}s to parse and publish once), "
+		f"data ready in {attached[1]:6.3f}s per worker, {attached[2]:7.1f} MiB private per worker")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,46 @@
+# Retrain time saved by warm start and partial_fit when new students arrive.
+# Run from 01-dslr: python benchmarks/bench_warm_start.py [path/to/dataset_train.csv] [new_fraction]
+# Works on the LogisticRegression API directly so no saved model is touched.
+import sys
+import time
+import numpy as np
+
+from common import SELECTED_FEATURES, train_all
+from LogisticRegression import LogisticRegression
+from Dataset import Dataset
+
+def accuracy(model, thetas, X, y):
+	model.tetha_values = thetas
+	return np.mean(model.predict(X) == y)
+
+def main():
+	path = sys.argv[1] if len(sys.argv) > 1 else "Dataset/dataset_train.csv"
+	new_fraction = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+	np.random.seed(42)
+	dataset = Dataset(path)
+	dataset.select_features(list(SELECTED_FEATURES))
+	mapping = dataset.prepare_data()
+	X, y = dataset.get_data()
+	order = np.random.permutation(len(y))
+	X, y = X[order].astype(float), y[order]
+	n_old = int(len(y) * (1 - new_fraction))
+
+	cold = LogisticRegression(mapping=mapping, lr=0.003, num_iter=20000)
+	warm = LogisticRegression(mapping=mapping, lr=0.003, num_iter=20000, tol=1e-5)
+	old_thetas, _, _ = train_all(cold, X[:n_old], y[:n_old])
+
+	cold_thetas, cold_time, cold_iter = train_all(cold, X, y)
+	warm_thetas, warm_time, warm_iter = train_all(warm, X, y, initial=old_thetas)
+	cold.tetha_values = [theta.copy() for theta in old_thetas]
+	start = time.perf_counter()
+	cold.partial_fit(X[n_old:], y[n_old:], num_iter=100)
+	partial_time = time.perf_counter() - start
+	partial_thetas = cold.tetha_values
+
+	print(f"{len(y)} students, {len(y) - n_old} new:")
+	print(f"  cold retrain   {cold_time:7.2f}s {cold_iter:6} iterations  accuracy {accuracy(cold, cold_thetas, X, y):.4f}")
+	print(f"  warm start     {warm_time:7.2f}s {warm_iter:6} iterations  accuracy {accuracy(cold, warm_thetas, X, y):.4f}  ({cold_time / warm_time:.1f}x faster)")
+	print(f"  partial_fit    {partial_time:7.2f}s {100 * len(cold.unique_labels):6} iterations  accuracy {accuracy(cold, partial_thetas, X, y):.4f}  ({cold_time / partial_time:.1f}x faster)")
+
+if __name__ == "__main__":
+	main()
@@ -0,0 +1,34 @@
+# Shared by the benchmarks: srcs on the import path, the feature set they
+# train on and one-vs-all training that saves nothing.
+import os
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'srcs'))
+
+# the default features of logreg_train.py
+SELECTED_FEATURES = [6, 7, 8, 5, 9, 10, 11, 12, 13]
+# first name, last name, birthday and best hand
+STRING_FEATURES = [0, 1, 2, 3]
+
+# One theta per house with the model's settings, from zeros or from
+# initial[i]. Sets the model's thetas and returns them with the seconds spent
+# and the iterations (GD) or epochs (SGD) run
+def train_all(model, X, y, stochastic=False, initial=None):
+	if model.unique_labels is None:
+		model.unique_labels = np.unique(y)
+	thetas = []
+	iterations = 0
+	start = time.perf_counter()
+	for i, label in enumerate(model.unique_labels):
+		y_i = np.where(y == label, 1, 0)
+		theta = initial[i] if initial is not None else None
+		if stochastic:
+			theta, cost_history, _ = model.stochastic_gradient_descent(X, y_i, theta=theta)
+		else:
+			theta, cost_history, _ = model.gradient_descent(X, y_i, theta)
+		thetas.append(theta)
+		iterations += len(cost_history)
+	model.tetha_values = thetas
+	return thetas, time.perf_counter() - start, iterations
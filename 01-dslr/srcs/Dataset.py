@@ -2,24 +2,41 @@
 import pandas as pd
 import numpy as np
 import os
+from profiler import profiler
+from sparse import CSRMatrix
+from shared import SharedDataset
 
 class Dataset:
-	def __init__(self, path, predict=False):
+	# encoding of the string features: 'codes' or 'onehot', see encode_features
+	def __init__(self, path, predict=False, encoding="codes"):
 		self.path = path
 		if not os.path.exists(path):
 			raise FileNotFoundError("File not found")
+		if encoding not in ("codes", "onehot"):
+			raise ValueError(f"unknown encoding {encoding!r}, expected codes or onehot")
 
 		self.x = None
 		self.y = None
+		# raw column mean/min/max of the selected features, saved with the
+		# model so prediction can preprocess rows the same way
+		self.stats = None
+		self.encoding = encoding
+		# {feature: sorted values} of the selected string features and their
+		# one-hot blocks, appended to x by prepare_data
+		self.categories = {}
+		self.onehot = []
 		self.predict = predict
 		self.read_dataset()
 
 	def read_dataset(self):
-
-		data = pd.read_csv(self.path)
-		self.x = data.iloc[:, 2:].values
+		with profiler.section("load"):
+			data = pd.read_csv(self.path)
+		# kept as a DataFrame, each column with its own type: one object
+		# array of every column would turn the numbers into objects too
+		self.x = data.iloc[:, 2:]
 		if not self.predict:
 			self.y = data.iloc[:, 1].values
+		profiler.count("rows", len(data))
 		
 
 	# min-max normalization
@@ -35,27 +52,68 @@ class Dataset:
 		train_indices, test_indices = indices[test_size:], indices[:test_size]
 		return self.x[train_indices], self.x[test_indices], self.y[train_indices], self.y[test_indices]
 
+	# Publishes the prepared x and y in shared memory for worker processes,
+	# see shared.SharedDataset. With test_size the rows are first shuffled as
+	# in get_train_test_data but stored test rows first, so a worker gets the
+	# same split as views instead of copies
+	def share(self, test_size=None):
+		x, y = self.x, self.y
+		n_test = 0
+		if test_size:
+			indices = np.random.permutation(x.shape[0])
+			n_test = int(x.shape[0] * test_size)
+			x, y = x[indices], y[indices]
+		return SharedDataset.publish(x, y, n_test)
+
 	def get_data(self):
 		return self.x, self.y
 
 	def get_data_shape(self):
 		return self.x.shape, self.y.shape
 	
-	def select_features(self, features, use_hands=False):
+	# String features are encoded with the given categories (those of a saved
+	# model) or with the values found in this file
+	def select_features(self, features, use_hands=False, categories=None):
 		if use_hands:
 			features.append(3) # add the hand feature
 			
-		self.x = self.x[:, features]
-		if 3 in features:
-			self.x[:, -1] = (self.x[:, -1] == "Right").astype(int)
+		frame = self.x.iloc[:, features]
+		self.categories = learn_categories(frame, features) if categories is None else categories
+		self.x, self.onehot = encode_features(frame, features, self.categories, self.encoding)
+
+	# dtype is fixed here once (float32 halves the memory the model reads per
+	# iteration), so training and prediction never cast the matrix again
+	def prepare_data(self, dtype=np.float64):
+		with profiler.section("preprocess"):
+			return self._prepare_data(dtype)
 
-	def prepare_data(self):
+	def _prepare_data(self, dtype):
 		#fill nan values with the mean of the column
-		self.x = pd.DataFrame(self.x)
+		self.x = pd.DataFrame(self.x, dtype=dtype)
+		self.stats = {'mean': self.x.mean().tolist(), 'min': self.x.min().tolist(), 'max': self.x.max().tolist()}
+		if self.categories:
+			self.stats.update(categories=self.categories, encoding=self.encoding)
 		self.x = self.x.fillna(self.x.mean())
 		self.x = self.x.values
 		#normalize the data
 		self.normalize()
+		# one-hot columns are already 0/1 and take no scaling
+		if self.onehot:
+			self.x = CSRMatrix.hstack([self.x] + [block.astype(dtype) for block in self.onehot])
+		return self.encode_labels()
+
+	# Same as prepare_data for rows given to an already trained model: NaN
+	# filling and scaling use its saved stats, not this file's, as in
+	# logreg_predict
+	def prepare_data_with_stats(self, stats, dtype=np.float64):
+		with profiler.section("preprocess"):
+			self.stats = stats
+			self.x = apply_stats(np.array(self.x, dtype=dtype), stats)
+			if self.onehot:
+				self.x = CSRMatrix.hstack([self.x] + [block.astype(dtype) for block in self.onehot])
+			return self.encode_labels()
+
+	def encode_labels(self):
 		if self.predict:
 			return 
 		#manually encode the labels
@@ -66,4 +124,42 @@ class Dataset:
 		return {i: label for i, label in enumerate(unique_labels)}
 
 		
-		
\ No newline at end of file
+		
+
+# {feature: sorted values} of the string columns of frame, whose columns are
+# the given features
+def learn_categories(frame, features):
+	return {feature: sorted(frame.iloc[:, j].dropna().unique().tolist())
+		for j, feature in enumerate(features) if not pd.api.types.is_numeric_dtype(frame.iloc[:, j])}
+
+# Float matrix of the features in frame, string features encoded against
+# categories ({feature: values}). With 'codes' a string feature is one column
+# of category codes, NaN when missing or unseen, so it is filled and scaled
+# like any other. With 'onehot' it is one 0/1 column per category, returned
+# as CSRMatrix blocks to be appended after the dense columns. Returns the
+# dense matrix and the list of one-hot blocks
+def encode_features(frame, features, categories, encoding="codes", dtype=np.float64):
+	dense, onehot = [], []
+	for j, feature in enumerate(features):
+		values = frame.iloc[:, j]
+		if feature not in categories:
+			dense.append(values.to_numpy(dtype=dtype))
+			continue
+		codes = pd.Categorical(values, categories=categories[feature]).codes
+		if encoding == "onehot":
+			onehot.append(CSRMatrix.one_hot(codes, len(categories[feature]), dtype))
+		else:
+			dense.append(np.where(codes < 0, np.nan, codes).astype(dtype))
+	x = np.column_stack(dense) if dense else np.empty((len(frame), 0), dtype=dtype)
+	return x, onehot
+
+# Same preprocessing as prepare_data, but with given stats and in place on a
+# float chunk, so rows can be streamed without seeing the whole file
+def apply_stats(x, stats):
+	missing = np.isnan(x)
+	if missing.any():
+		x[missing] = np.take(stats['mean'], np.nonzero(missing)[1])
+	low = np.asarray(stats['min'])
+	x -= low
+	x /= np.asarray(stats['max']) - low
+	return x
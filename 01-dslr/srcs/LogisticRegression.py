@@ -4,129 +4,324 @@ import sys
 import os
 from os import path
 from tqdm import tqdm
+from profiler import profiler
+from optimizers import make_optimizer, make_schedule
+from sparse import CSRMatrix
 
 class LogisticRegression:
-	def __init__(self, mapping=None, lr=0.01, num_iter=100000, selected_features=None):
+	def __init__(self, mapping=None, lr=0.01, num_iter=100000, selected_features=None, tol=None, stats=None, dtype=np.float64, optimizer="gd", schedule=None, checkpoint_every=None, model_dir="."):
 		self.lr = lr
 		self.num_iter = num_iter
+		# stop a class early once the cost improves by less than tol
+		self.tol = tol
 		self.selected_features = selected_features
+		# preprocessing stats of the training features, see Dataset.apply_stats
+		self.stats = stats
+		# float type of X, thetas and labels in every computation
+		self.dtype = np.dtype(dtype)
+		# update rule and learning-rate schedule names, see optimizers.py
+		self.optimizer = optimizer
+		self.schedule = schedule
+		# fit saves checkpoint.npz every checkpoint_every iterations (GD) or
+		# epochs (SGD); current_class and run_config are only set during fit
+		self.checkpoint_every = checkpoint_every
+		# thetas.csv, params.csv and checkpoint.npz are read and written here
+		self.model_dir = model_dir
+		self.checkpoint_path = self.model_file('checkpoint.npz')
+		self.current_class = None
+		self.run_config = None
 		self.tetha_values = None
 		self.unique_labels = np.array(list(mapping.keys())) if mapping else None
 		self.cost_history = None
 		self.precision_history = None
 		self.mapping : dict = mapping
-		if not mapping and path.exists('thetas.csv') and path.exists('params.csv'):
+		if not mapping and path.exists(self.model_file('thetas.csv')) and path.exists(self.model_file('params.csv')):
 			print("model already trained, loading thetas and params...")
 			self.load_thetas_and_params()
 		elif not mapping:
 			print("model not trained yet, please train it first.")
 			sys.exit(1)
 
+	def model_file(self, name):
+		return path.join(self.model_dir, name)
+
+	def read_thetas(self):
+		with open(self.model_file('thetas.csv'), 'r') as f:
+			return [np.array(eval(line)) for line in f]
+
 	def load_thetas_and_params(self):
-		with open('thetas.csv', 'r') as f:
-			self.tetha_values = [np.array(eval(line)) for line in f]
+		with profiler.section("load_model"):
+			self._load_thetas_and_params()
+
+	def _load_thetas_and_params(self):
+		self.tetha_values = self.read_thetas()
 
-		with open('params.csv', 'r') as f:
+		with open(self.model_file('params.csv'), 'r') as f:
 			self.lr = float(f.readline())
 			self.num_iter = int(f.readline())
 			self.mapping = eval(f.readline())
 			self.selected_features = eval(f.readline())
+			# models saved before the stats were kept have no fifth line
+			stats = f.readline().strip()
+			self.stats = eval(stats) if stats else None
 			self.unique_labels = np.array(list(self.mapping.keys()))
 		
+	# A diverged model (inf or nan thetas) is not saved: thetas.csv is read
+	# back with eval, which knows neither
 	def save_thetas(self):
-		with open('thetas.csv', 'w') as f:
+		if not all(np.isfinite(theta).all() for theta in self.tetha_values):
+			raise ValueError("training diverged, the thetas are not finite and were not saved; try a lower --lr")
+		os.makedirs(self.model_dir, exist_ok=True)
+		with open(self.model_file('thetas.csv'), 'w') as f:
 			for i in range(len(self.unique_labels)):
 				f.write(f"{self.tetha_values[i].tolist()}\n")
 
+	# Training state written atomically to checkpoint.npz: the classes already
+	# trained, theta, iteration, histories and optimizer state of the class in
+	# progress, and the NumPy RNG state. An empty theta marks a class not
+	# started yet
+	def save_checkpoint(self, iteration, theta, optimizer, cost_history, precision_history):
+		rng = np.random.get_state()
+		arrays = {
+			"config": np.array(self.run_config),
+			"class_index": np.array(self.current_class),
+			"iteration": np.array(iteration),
+			"theta": theta,
+			"cost_history": np.asarray(cost_history),
+			"precision_history": np.asarray(precision_history),
+			"done_thetas": np.array(self.tetha_values, dtype=self.dtype),
+			"done_lengths": np.array([len(history) for history in self.cost_history], dtype=np.int64),
+			"done_costs": np.asarray([cost for history in self.cost_history for cost in history]),
+			"done_precisions": np.asarray([p for history in self.precision_history for p in history]),
+			"rng_keys": rng[1],
+			"rng_pos": np.array(rng[2]),
+			"rng_has_gauss": np.array(rng[3]),
+			"rng_gauss": np.array(rng[4]),
+		}
+		if optimizer is not None:
+			arrays.update({f"optimizer_{name}": value for name, value in optimizer.state().items()})
+		os.makedirs(self.model_dir, exist_ok=True)
+		with open(self.checkpoint_path + ".tmp", "wb") as f:
+			np.savez(f, **arrays)
+		os.replace(self.checkpoint_path + ".tmp", self.checkpoint_path)
+
+	# The saved state as a dict, or None if there is none for this same run
+	def load_checkpoint(self):
+		if not path.exists(self.checkpoint_path):
+			print("no checkpoint found, training from the start.")
+			return None
+		with np.load(self.checkpoint_path) as data:
+			state = {name: data[name] for name in data.files}
+		if str(state["config"]) != self.run_config:
+			print("the checkpoint was saved with other data or settings, training from the start.")
+			return None
+		return state
+
+	def checkpoint(self, iteration, theta, optimizer, cost_history, precision_history):
+		if self.checkpoint_every and self.current_class is not None and iteration % self.checkpoint_every == 0:
+			with profiler.section("checkpoint"):
+				self.save_checkpoint(iteration, theta, optimizer, cost_history, precision_history)
+
 	def save_params(self):
-		with open('params.csv', 'w') as f:
+		os.makedirs(self.model_dir, exist_ok=True)
+		with open(self.model_file('params.csv'), 'w') as f:
 			f.write(f"{self.lr}\n")
 			f.write(f"{self.num_iter}\n")
 			f.write(f"{self.mapping}\n")
 			f.write(f"{self.selected_features}\n")
+			if self.stats is not None:
+				f.write(f"{self.stats}\n")
 
 
-	# g(z) = 1/1 + e−z
+	# g(z) = 1/1 + e−z, written with tanh so it never overflows in exp
 	def sigmoid(self, X):
-		return 1 / (1 + np.exp(-X.astype(float)))
+		return 0.5 * (1 + np.tanh(0.5 * X))
+
+	# log(1 + e^z) without overflow; several times faster than np.logaddexp(0, z)
+	def softplus(self, z):
+		return np.maximum(z, 0) + np.log1p(np.exp(-np.abs(z)))
 	
-	# hθ(x) = g(θT x)
+	# hθ(x) = g(θT x). X is a dense array or a sparse.CSRMatrix (one-hot
+	# categorical features); both support X @ θ and X.T @ r
 	def h0(self, X, tetha):
 		return self.sigmoid(X @ tetha)
 	
 	# J(θ) = 1/m∑yi log(hθ(xi)) + (1 −yi) log(1 −hθ(xi))
+	#      = 1/m∑log(1 + e^zi) − yi zi  with zi = θT xi
+	# The softplus form works on the logits, so it is finite even where
+	# hθ saturates to exactly 0 or 1
 	def cost_function(self, X, y, tetha):
-		return np.sum(-y * np.log(self.h0(X, tetha)) - (1 - y) * np.log(1 - self.h0(X, tetha))) / len(y)
+		z = X @ tetha
+		return np.mean(self.softplus(z) - y * z)
+
+	# Cost, gradient and hθ(x) from a single X @ θ: the logits feed both the
+	# softplus cost and the sigmoid of the gradient. The gradient is the sum
+	# ∑(hθ(xi) −yi)xi, callers fold the 1/m into the step size. Per-sample
+	# SGD steps skip the cost with with_cost=False
+	def loss_gradient(self, X, y, tetha, with_cost=True):
+		z = X @ tetha
+		h = self.sigmoid(z)
+		cost = np.mean(self.softplus(z) - y * z) if with_cost else None
+		return cost, X.T @ (h - y), h
 	
+	def converged(self, cost_history):
+		return self.tol is not None and len(cost_history) > 1 and abs(cost_history[-2] - cost_history[-1]) < self.tol
+
 	# ∂/∂θj J(θ) = 1/m∑(hθ(xi) −yi)xi
-	def gradient_descent(self, X, y):
+	def gradient_descent(self, X, y, theta=None, num_iter=None, resume=None):
 		m, n = X.shape
-		theta = np.zeros(n, dtype=float)
+		theta = np.zeros(n, dtype=self.dtype) if theta is None else np.array(theta, dtype=self.dtype)
+		y = np.asarray(y, dtype=self.dtype)
 		cost_history = []
 		precision_history = []
-		for i in tqdm(range(self.num_iter)):
-			h = self.h0(X, theta)
-			gd = X.T @ (h - y) / m
-			theta -= self.lr * gd.astype(float)
-			cost = self.cost_function(X, y, theta)
-			cost_history.append(cost)
-			precision_history.append(self.precision(y, h))
+		num_iter = num_iter or self.num_iter
+		optimizer = make_optimizer(self.optimizer)
+		lr = make_schedule(self.schedule or "constant", self.lr, num_iter)
+		loss = (lambda t: self.cost_function(X, y, t)) if optimizer.needs_loss else None
+		start = 0
+		if resume is not None:
+			theta, start, cost_history, precision_history = self.resume_class(resume, optimizer)
+		for i in tqdm(range(start, num_iter)):
+			# cost and precision are those of θ before this step
+			with profiler.section("gd_step"):
+				cost, gd, h = self.loss_gradient(X, y, theta)
+				gd /= m
+				optimizer.step(theta, gd, lr(i), cost, loss)
+			with profiler.section("metrics"):
+				cost_history.append(cost)
+				precision_history.append(self.precision(y, h))
+			if self.converged(cost_history):
+				break
+			self.checkpoint(i + 1, theta, optimizer, cost_history, precision_history)
+		profiler.count("gd_iterations", len(cost_history))
 		return theta, cost_history, precision_history
 	
-	def stochastic_gradient_descent(self, X, y, schedule_lr=False):
+	def stochastic_gradient_descent(self, X, y, schedule_lr=False, theta=None, num_iter=None, resume=None):
 		m, n = X.shape
-		theta = np.zeros(n, dtype=float)
+		theta = np.zeros(n, dtype=self.dtype) if theta is None else np.array(theta, dtype=self.dtype)
+		y = np.asarray(y, dtype=self.dtype)
 		cost_history = []
 		precision_history = []
-		lr_tmp = self.lr
-		for i in tqdm(range(self.num_iter)):
-			if schedule_lr:
-				lr_tmp = lr_tmp * (1 - 0.005 * i)
-			for j in range(m):
-				rand_index = np.random.randint(0, m)
-				X_i = X[rand_index, :].reshape(1, n)
-				y_i = y[rand_index].reshape(1)
-				h = self.h0(X_i, theta)
-				gd = X_i.T @ (h - y_i)
-				theta -= lr_tmp * gd.astype(float)
-			cost = self.cost_function(X, y, theta)
-			cost_history.append(cost)
-			precision_history.append(self.precision(y, self.h0(X, theta)))
+		num_iter = num_iter or self.num_iter
+		optimizer = make_optimizer(self.optimizer)
+		# schedule_lr keeps its old meaning: a decaying rate unless one is chosen
+		schedule = self.schedule or ("inverse_time" if schedule_lr else "constant")
+		lr = make_schedule(schedule, self.lr, num_iter)
+		loss = (lambda t: self.cost_function(X_i, y_i, t)) if optimizer.needs_loss else None
+		start = 0
+		if resume is not None:
+			theta, start, cost_history, precision_history = self.resume_class(resume, optimizer)
+		for i in tqdm(range(start, num_iter)):
+			lr_i = lr(i)
+			with profiler.section("sgd_epoch"):
+				for j in range(m):
+					rand_index = np.random.randint(0, m)
+					# a one-row slice, of a dense array or of a CSRMatrix
+					X_i = X[rand_index:rand_index + 1]
+					y_i = y[rand_index:rand_index + 1]
+					_, gd, _ = self.loss_gradient(X_i, y_i, theta, with_cost=False)
+					optimizer.step(theta, gd, lr_i, None, loss)
+			with profiler.section("metrics"):
+				cost, _, h = self.loss_gradient(X, y, theta)
+				cost_history.append(cost)
+				precision_history.append(self.precision(y, h))
+			if self.converged(cost_history):
+				break
+			self.checkpoint(i + 1, theta, optimizer, cost_history, precision_history)
+		profiler.count("sgd_epochs", len(cost_history))
+		profiler.count("sgd_steps", m * len(cost_history))
 			
 		return theta, cost_history, precision_history
 	
 	
-	def fit(self, X, y, stochastic=False, schedule_lr=False):
+	# Theta, iteration, histories and optimizer state of the class in progress
+	def resume_class(self, state, optimizer):
+		optimizer.load_state({name[len("optimizer_"):]: value for name, value in state.items() if name.startswith("optimizer_")})
+		return (state["theta"].copy(), int(state["iteration"]),
+			list(state["cost_history"]), list(state["precision_history"]))
+
+	# plot=False skips the cost and precision plots, as in worker processes
+	def fit(self, X, y, stochastic=False, schedule_lr=False, warm_start=False, resume=False, plot=True):
 		self.unique_labels = np.unique(y)
 		num_labels = len(self.unique_labels)
+		num_iter = self.num_iter
+		# the sums fingerprint the data, so other rows or features of the
+		# same shape do not resume from this run
+		x_sum = float((X.data if isinstance(X, CSRMatrix) else X).sum())
+		self.run_config = str((self.lr, num_iter, self.optimizer, self.schedule, stochastic, schedule_lr,
+			self.tol, self.dtype.name, X.shape, self.unique_labels.tolist(), self.selected_features,
+			x_sum, float(np.sum(y))))
+		# warm start: begin from the saved thetas.csv rather than zeros
+		initial = self.read_thetas() if warm_start and path.exists(self.model_file('thetas.csv')) else None
+		if initial is not None and (len(initial) != num_labels or len(initial[0]) != X.shape[1]):
+			print("saved thetas do not match this model, starting from zeros.")
+			initial = None
 		self.tetha_values = []
 		self.cost_history = []
 		self.precision_history = []
-		for i in range(num_labels):
+		state = self.load_checkpoint() if resume else None
+		first = 0
+		if state is not None:
+			first = int(state["class_index"])
+			self.tetha_values = list(state["done_thetas"])
+			splits = np.cumsum(state["done_lengths"])[:-1]
+			self.cost_history = [list(history) for history in np.split(state["done_costs"], splits)][:first]
+			self.precision_history = [list(history) for history in np.split(state["done_precisions"], splits)][:first]
+			np.random.set_state(("MT19937", state["rng_keys"], int(state["rng_pos"]),
+				int(state["rng_has_gauss"]), float(state["rng_gauss"])))
+			print(f"resuming from class {first}, iteration {int(state['iteration'])}.")
+		for i in range(first, num_labels):
+			self.current_class = i
 			y_i = np.where(y == self.unique_labels[i], 1, 0)
-			tetha, cost_history, precision_history = self.stochastic_gradient_descent(X, y_i, schedule_lr) \
-				if stochastic else self.gradient_descent(X, y_i)
+			theta = initial[i] if initial is not None else None
+			# the class in progress when the checkpoint was taken
+			started = state if state is not None and i == first and state["theta"].size else None
+			tetha, cost_history, precision_history = self.stochastic_gradient_descent(X, y_i, schedule_lr, theta, resume=started) \
+				if stochastic else self.gradient_descent(X, y_i, theta, resume=started)
 			self.tetha_values.append(tetha)
 			self.cost_history.append(cost_history)
 			self.precision_history.append(precision_history)
+			self.current_class = i + 1
+			if self.checkpoint_every:
+				self.save_checkpoint(0, np.empty(0, dtype=self.dtype), None, [], [])
+		self.current_class = None
+		# results first, so closing or killing a plot window loses nothing
+		with profiler.section("save"):
+			self.save_thetas()
+			self.save_params()
+		# only a checkpoint this run resumed from or wrote, another run's
+		# stays resumable
+		if (state is not None or self.checkpoint_every) and path.exists(self.checkpoint_path):
+			os.remove(self.checkpoint_path)
+		if not plot:
+			return
 		if not os.path.exists("srcs/plotting/plots"):
 			os.mkdir("srcs/plotting/plots")
-			
-		self.plot_cost()
-		self.plot_precision()
-		self.save_thetas()
-		self.save_params()
+		with profiler.section("plot"):
+			self.plot_cost()
+			self.plot_precision()
 
-	def predict(self, X):
+	# Incremental update on a new batch only: num_iter full-batch steps per
+	# class from the current thetas, old rows are not revisited
+	def partial_fit(self, X, y, num_iter=100):
 		if self.tetha_values is None or self.unique_labels is None:
 			print("You need to train the model first.")
 			sys.exit(1)
-		predictions = []
 		for i in range(len(self.unique_labels)):
-			probabilities = self.h0(X, self.tetha_values[i])
-			predictions.append(probabilities)
-		predictions = np.array(predictions)
-		return self.unique_labels[np.argmax(predictions, axis=0)]
+			y_i = np.where(y == self.unique_labels[i], 1, 0)
+			self.tetha_values[i], _, _ = self.gradient_descent(X, y_i, self.tetha_values[i], num_iter)
+
+	def predict(self, X):
+		if self.tetha_values is None or self.unique_labels is None:
+			print("You need to train the model first.")
+			sys.exit(1)
+		with profiler.section("predict"):
+			predictions = []
+			for i in range(len(self.unique_labels)):
+				probabilities = self.h0(X, np.asarray(self.tetha_values[i], dtype=self.dtype))
+				predictions.append(probabilities)
+			predictions = np.array(predictions)
+			return self.unique_labels[np.argmax(predictions, axis=0)]
 	
 	
 	def precision(self, y, h):
@@ -1,58 +1,172 @@
 from LogisticRegression import LogisticRegression
-from Dataset import Dataset
+from Dataset import apply_stats, encode_features
+from sparse import CSRMatrix
+from metrics import confusion_matrix, accuracy, print_report, print_mismatches
+from profiler import profiler
+from queue import Queue
+from threading import Event, Thread
 import sys
+import time
 import numpy as np
 import random
 import pandas as pd
 
-def confusion_matrix(y_true, y_pred, mapping, unique_labels):
-	matrix = np.zeros((len(unique_labels), len(unique_labels)))
-	reverse_mapping = {v: k for k, v in mapping.items()}
-	for i in range(len(y_true)):
-		matrix[reverse_mapping[y_true[i]], y_pred[i]] += 1
-	print("Confusion matrix x-axis: Actual, y-axis: Predicted")
-	print(matrix)
-	print("The samples are as follows:")
-	for i in range(len(unique_labels)):
-		print(f"Samples for {mapping[unique_labels[i]]}: {np.sum(matrix[i])}")
-
-		print(f"Precision for {mapping[unique_labels[i]]}: {matrix[i, i] / np.sum(matrix[i])}")
-
-def compare_results(y_pred, ds_name, mapping):
-	ds = pd.read_csv(ds_name)
-	y_true = ds.iloc[:, 1].values
-	unique_labels = list(mapping.keys())
-	count = 0
-	for i in range(len(y_pred)):
-		print(f"Predicted: {y_pred[i]} Actual: {y_true[i]}")
-		if mapping[unique_labels[y_pred[i]]] != y_true[i]:
-			count += 1
-	print(f"Total wrong predictions: {count} out of {len(y_pred)}")
-	print("Precision: ", 1 - count / len(y_pred))
-
-	confusion_matrix(y_true, y_pred, mapping, unique_labels)
-	
+USAGE = ("Usage: python logreg_predict.py path/to/dataset.csv --chunksize N(optional) --model-dir DIR(optional) --float32(optional) "
+	"--verbose(optional) --profile(optional) --cprofile(optional)")
+FLAGS = ("--verbose", "--float32", "--profile", "--cprofile")
+# chunks allowed in flight between the reader, the model and the writer
+QUEUE_SIZE = 2
+
+def compare_results(y_pred, ds_name, mapping, verbose=False):
+	y_true = pd.read_csv(ds_name, usecols=[1]).iloc[:, 0]
+	class_names = [mapping[label] for label in mapping]
+	y_true = y_true.map({name: i for i, name in enumerate(class_names)})
+	known = y_true.notna().to_numpy()
+	y_true = y_true[known].to_numpy(dtype=int)
+	y_pred = np.asarray(y_pred)[known]
+	with profiler.section("metrics"):
+		if verbose:
+			print_mismatches(y_true, y_pred, class_names)
+		matrix = confusion_matrix(y_true, y_pred, len(class_names))
+		print_report(matrix, class_names)
+		print("Precision: ", accuracy(matrix))
+
+# Column names of the selected features; like Dataset, feature i is the
+# i-th column after Index and Hogwarts House
+def feature_columns(path, features):
+	columns = pd.read_csv(path, nrows=0).columns
+	return [columns[feature + 2] for feature in features]
+
+# (dense, one-hot blocks) chunks of the selected features, string features
+# encoded with the model's categories as in Dataset.encode_features
+def read_chunks(path, features, chunksize, dtype=np.float64, categories=None, encoding="codes"):
+	columns = feature_columns(path, features)
+	for chunk in pd.read_csv(path, usecols=columns, chunksize=chunksize):
+		yield encode_features(chunk[columns], features, categories or {}, encoding, dtype)
+
+# One pass over the file for the stats of models saved without them
+def scan_stats(path, features, chunksize):
+	total, count = 0, 0
+	low, high = np.inf, -np.inf
+	for x, _ in read_chunks(path, features, chunksize):
+		total = total + np.nansum(x, axis=0)
+		count = count + np.sum(~np.isnan(x), axis=0)
+		low = np.fmin(low, np.nanmin(x, axis=0))
+		high = np.fmax(high, np.nanmax(x, axis=0))
+	return {'mean': (total / count).tolist(), 'min': low.tolist(), 'max': high.tolist()}
+
+# Both workers keep their exception for the main thread to re-raise, and
+# keep draining or closing their queue so no stage is left blocked on it
+def reader(chunks, queue, stop, errors):
+	try:
+		chunks = iter(chunks)
+		while not stop.is_set():
+			with profiler.section("read"):
+				x = next(chunks, None)
+			if x is None:
+				break
+			queue.put(x)
+	except BaseException as e:
+		errors.append(e)
+	finally:
+		queue.put(None)
+
+def writer(out, names, queue, errors):
+	index = 0
+	while True:
+		preds = queue.get()
+		if preds is None:
+			break
+		if errors:
+			continue
+		try:
+			with profiler.section("write"):
+				out.write("".join(f"{i},{house}\n" for i, house in enumerate(names[preds].tolist(), index)))
+		except BaseException as e:
+			errors.append(e)
+		index += len(preds)
+
+# read N rows -> preprocess with the saved stats -> predict -> write, with
+# reading and writing in their own threads; only QUEUE_SIZE chunks per
+# stage are held at once so memory does not grow with the file
+def predict_stream(lr, path, output="houses.csv", chunksize=100_000, keep=False):
+	stats = lr.stats
+	if stats is None:
+		print("no preprocessing stats saved with the model, computing them on this file...")
+		stats = scan_stats(path, lr.selected_features, chunksize)
+	names = np.array([lr.mapping[label] for label in lr.unique_labels])
+	inputs, outputs = Queue(QUEUE_SIZE), Queue(QUEUE_SIZE)
+	stop = Event()
+	read_errors, write_errors = [], []
+	kept = []
+	rows = 0
+	start = time.perf_counter()
+	with open(output, "w", buffering=1 << 20) as f:
+		f.write("Index,Hogwarts House\n")
+		chunks = read_chunks(path, lr.selected_features, chunksize, lr.dtype, stats.get('categories'), stats.get('encoding', "codes"))
+		read_thread = Thread(target=reader, args=(chunks, inputs, stop, read_errors))
+		write_thread = Thread(target=writer, args=(f, names, outputs, write_errors))
+		read_thread.start()
+		write_thread.start()
+		x = None
+		try:
+			while not write_errors:
+				x = inputs.get()
+				if x is None:
+					break
+				with profiler.section("preprocess"):
+					dense, onehot = x
+					x = apply_stats(dense, stats)
+					if onehot:
+						x = CSRMatrix.hstack([x] + onehot)
+				preds = np.searchsorted(lr.unique_labels, lr.predict(x))
+				outputs.put(preds)
+				rows += len(preds)
+				if keep:
+					kept.append(preds)
+		finally:
+			stop.set()
+			while x is not None:
+				x = inputs.get()
+			outputs.put(None)
+			read_thread.join()
+			write_thread.join()
+	for errors in (read_errors, write_errors):
+		if errors:
+			raise errors[0]
+	elapsed = time.perf_counter() - start
+	profiler.count("rows", rows)
+	print(f"Predicted {rows} students in {elapsed:.2f}s ({rows / max(elapsed, 1e-9):,.0f} rows/s)")
+	return np.concatenate(kept) if kept else None
 
 def main():
 	np.random.seed(42)
 	random.seed(42)
-	if len(sys.argv) == 2:
-		lr = LogisticRegression()
-		dataset = Dataset(sys.argv[1], predict=True)
-		dataset.select_features(lr.selected_features)
-		dataset.prepare_data()
-		X, _ = dataset.get_data()
-		preds = lr.predict(X)
-		with open("houses.csv", "w") as f:
-			f.write("Index,Hogwarts House\n")
-			for i, pred in enumerate(preds):
-				f.write(f"{i},{lr.mapping[lr.unique_labels[pred]]}\n")
+	verbose = "--verbose" in sys.argv
+	float32 = "--float32" in sys.argv
+	args = [arg for arg in sys.argv[1:] if arg not in FLAGS]
+	chunksize = 100_000
+	if "--chunksize" in args:
+		i = args.index("--chunksize")
+		chunksize = int(args[i + 1])
+		del args[i:i + 2]
+	model_dir = "."
+	if "--model-dir" in args:
+		i = args.index("--model-dir")
+		model_dir = args[i + 1]
+		del args[i:i + 2]
+	if len(args) == 1:
+		lr = LogisticRegression(model_dir=model_dir)
+		if float32:
+			lr.dtype = np.dtype(np.float32)
+		compare = "train" in args[0]
+		preds = predict_stream(lr, args[0], chunksize=chunksize, keep=compare)
 		print("Predictions saved in houses.csv")
-		if "train" in sys.argv[1]:
-			compare_results(preds, sys.argv[1], lr.mapping,)
+		if compare:
+			compare_results(preds, args[0], lr.mapping, verbose)
 
 	else:
-		print("Usage: python logreg_predict.py path/to/dataset.csv")
+		print(USAGE)
 
 if __name__ == "__main__":
-	main()
\ No newline at end of file
+	profiler.run(main, "logreg_predict", "--profile" in sys.argv, "--cprofile" in sys.argv)
@@ -0,0 +1,131 @@
+from LogisticRegression import LogisticRegression
+from Dataset import apply_stats
+from logreg_predict import read_chunks, scan_stats
+from profiler import profiler
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+USAGE = ("Usage: python logreg_score.py path/to/dataset.csv model_dir model_dir ... --chunksize N(optional) "
+	"--float32(optional) --profile(optional) --cprofile(optional)")
+FLAGS = ("--float32", "--profile", "--cprofile")
+
+# A/B scoring of saved models in one pass: the file is read once for the
+# union of their features and every model is scored by the same matmul.
+# A model's preprocessing (NaN -> its mean, then min-max) is affine, so it is
+# folded into its thetas on the raw values. With x0 the raw values with NaN
+# set to 0 and miss the NaN mask, the logit of class c of model k is
+#   z = b + x0 @ w + miss @ (w * mean),  w = θ / (max - min),  b = -min @ w
+# and [x0 miss] @ W gives the logits of every class of every model at once.
+
+# W of shape (2 * features, classes of all models), b, and the columns of
+# each model in them
+def stack_models(models, stats, features):
+	position = {feature: i for i, feature in enumerate(features)}
+	n = len(features)
+	blocks, biases, slices = [], [], []
+	start = 0
+	for model, model_stats in zip(models, stats):
+		thetas = np.array(model.tetha_values, dtype=np.float64).T
+		low, high, mean = (np.asarray(model_stats[key]) for key in ('min', 'max', 'mean'))
+		w = thetas / (high - low)[:, None]
+		rows = [position[feature] for feature in model.selected_features]
+		block = np.zeros((2 * n, thetas.shape[1]))
+		# add, not assign: a feature may be selected twice
+		np.add.at(block, rows, w)
+		np.add.at(block, [n + row for row in rows], w * mean[:, None])
+		blocks.append(block)
+		biases.append(-(low @ w))
+		slices.append(slice(start, start + thetas.shape[1]))
+		start += thetas.shape[1]
+	return np.hstack(blocks), np.concatenate(biases), slices
+
+# Categories of the string features: the file is read once, so every model
+# must encode them as the same codes. One-hot columns are not an affine
+# function of one raw column and cannot be folded
+def shared_categories(stats):
+	categories = {}
+	for model_stats in stats:
+		if model_stats.get('encoding') == "onehot":
+			raise ValueError("one-hot encoded models cannot be stacked, score them with logreg_predict.py")
+		for feature, values in model_stats.get('categories', {}).items():
+			if categories.setdefault(feature, values) != values:
+				raise ValueError(f"the models encode feature {feature} with different categories")
+	return categories
+
+# Predicted labels of every model on the file, and the seconds spent on
+# batched scoring and on scoring each model alone as logreg_predict does
+def score(models, stats, path, chunksize=100_000, dtype=np.float64):
+	features = sorted({feature for model in models for feature in model.selected_features})
+	categories = shared_categories(stats)
+	W, b, slices = stack_models(models, stats, features)
+	W, b = W.astype(dtype), b.astype(dtype)
+	position = {feature: i for i, feature in enumerate(features)}
+	own_columns = [[position[feature] for feature in model.selected_features] for model in models]
+	preds = [[] for _ in models]
+	batched, alone = 0.0, np.zeros(len(models))
+	for x, _ in read_chunks(path, features, chunksize, dtype, categories):
+		start = time.perf_counter()
+		with profiler.section("score"):
+			miss = np.isnan(x)
+			z = np.hstack((np.where(miss, 0, x), miss)) @ W + b
+			for k, model in enumerate(models):
+				preds[k].append(model.unique_labels[np.argmax(z[:, slices[k]], axis=1)])
+		batched += time.perf_counter() - start
+		for k, model in enumerate(models):
+			start = time.perf_counter()
+			with profiler.section("alone"):
+				model.predict(apply_stats(x[:, own_columns[k]], stats[k]))
+			alone[k] += time.perf_counter() - start
+	return [np.concatenate(p) for p in preds], batched, alone
+
+def print_table(model_dirs, models, preds, truth, batched, alone, rows):
+	names = [np.array([model.mapping[label] for label in model.unique_labels]) for model in models]
+	houses = [name[np.searchsorted(model.unique_labels, p)] for name, model, p in zip(names, models, preds)]
+	known = truth.notna().to_numpy()
+	width = max(len(d) for d in model_dirs + ["batched"])
+	print(f"{'model':<{width}}  features  {'accuracy':>8}  {'agrees':>6}  {'alone µs/row':>12}")
+	for k, model_dir in enumerate(model_dirs):
+		accuracy = f"{np.mean(houses[k][known] == truth[known].to_numpy()):.4f}" if known.any() else "-"
+		agrees = np.mean(houses[k] == houses[0])
+		print(f"{model_dir:<{width}}  {len(models[k].selected_features):8}  {accuracy:>8}  {agrees:6.4f}  "
+			f"{alone[k] / rows * 1e6:12.3f}")
+	print(f"{'batched':<{width}}  {'':8}  {'':>8}  {'':>6}  {batched / rows * 1e6:12.3f}"
+		f"  ({len(models)} models, {alone.sum() / max(batched, 1e-12):.1f}x faster than one by one)")
+
+def main():
+	float32 = "--float32" in sys.argv
+	args = [arg for arg in sys.argv[1:] if arg not in FLAGS]
+	chunksize = 100_000
+	if "--chunksize" in args:
+		i = args.index("--chunksize")
+		chunksize = int(args[i + 1])
+		del args[i:i + 2]
+	if len(args) < 2:
+		print(USAGE)
+		return
+	path, model_dirs = args[0], args[1:]
+	dtype = np.float32 if float32 else np.float64
+	models = [LogisticRegression(model_dir=model_dir) for model_dir in model_dirs]
+	stats = []
+	for model, model_dir in zip(models, model_dirs):
+		if model.stats is None:
+			print(f"no preprocessing stats saved with {model_dir}, computing them on this file...")
+		stats.append(model.stats or scan_stats(path, model.selected_features, chunksize))
+		model.dtype = np.dtype(dtype)
+	start = time.perf_counter()
+	try:
+		preds, batched, alone = score(models, stats, path, chunksize, dtype)
+	except ValueError as e:
+		print(f"Error: {e}")
+		return
+	elapsed = time.perf_counter() - start
+	rows = len(preds[0])
+	profiler.count("rows", rows)
+	truth = pd.read_csv(path, usecols=[1]).iloc[:, 0]
+	print(f"Scored {len(models)} models on {rows} students in {elapsed:.2f}s")
+	print_table(model_dirs, models, preds, truth, batched, alone, rows)
+
+if __name__ == "__main__":
+	profiler.run(main, "logreg_score", "--profile" in sys.argv, "--cprofile" in sys.argv)
@@ -1,20 +1,104 @@
 
 from LogisticRegression import LogisticRegression
 from Dataset import Dataset
+from metrics import confusion_matrix, accuracy, print_report, print_mismatches
+from profiler import profiler
+from optimizers import OPTIMIZERS, SCHEDULES
+from concurrent.futures import ProcessPoolExecutor
+import os
 import sys
 import numpy as np
 import random
 
-def confusion_matrix(y_true, y_pred, lr):
-	unique_labels = np.unique(y_true)
-	matrix = np.zeros((len(unique_labels), len(unique_labels)))
-	for i in range(len(y_true)):
-		matrix[y_true[i], y_pred[i]] += 1
-	print("Confusion matrix x-axis: Actual, y-axis: Predicted")
-	print(matrix)
-	print("The samples are as follows:")
-	for i in range(len(unique_labels)):
-		print(f"Samples for {lr.mapping[unique_labels[i]]}: {np.sum(matrix[i])}")
+# Options taking a value, with their defaults; lr and iterations default to
+# the values below for the chosen mode and optimizer
+OPTIONS = {"--optimizer": "gd", "--schedule": None, "--lr": None, "--iterations": None, "--checkpoint": None,
+	"--features": None, "--model-dir": ".", "--parallel": None}
+# starting rate of each optimizer for the min-max scaled features
+# (the line search's is its largest step)
+OPTIMIZER_LR = {"momentum": 0.003, "nesterov": 0.003, "adam": 0.05, "line_search": 10.0}
+# and the ones that differ for SGD, where each step sees one noisy sample
+STOCHASTIC_LR = {"line_search": 1.0}
+
+# how the value of each numeric option is read
+CONVERTERS = {"--lr": float, "--iterations": int, "--checkpoint": int,
+	"--features": lambda value: [int(feature) for feature in value.split(",")]}
+USAGE = """Usage: python logreg_train.py path/to/dataset.csv --stochastic(optional) --schedule_lr(optional) --warm-start(optional) --partial(optional) --float32(optional) --onehot(optional) --verbose(optional) --profile(optional) --cprofile(optional)
+  --optimizer gd|momentum|nesterov|adam|line_search --schedule constant|step|cosine|inverse_time --lr X --iterations N
+  --checkpoint N (iterations between checkpoints, 0 to disable) --resume (continue from checkpoint.npz)
+  --features i,j,... (feature columns to train on) --model-dir DIR (where the model is saved, . by default)
+  --parallel gd,adam,... (one model per optimizer, trained at once on shared data, saved in DIR/optimizer)"""
+
+# The options with their values converted, or None if one has no value or
+# an invalid one
+def parse_options(args):
+	options = dict(OPTIONS)
+	for option in options:
+		if option in args:
+			i = args.index(option)
+			if i + 1 == len(args):
+				return None
+			options[option] = args[i + 1]
+	try:
+		for option, convert in CONVERTERS.items():
+			if options[option] is not None:
+				options[option] = convert(options[option])
+	except ValueError:
+		return None
+	return options
+
+# Update the saved model with the rows of a new file only
+def partial_train(path, dtype=np.float64, model_dir="."):
+	lr = LogisticRegression(model_dir=model_dir)
+	lr.dtype = np.dtype(dtype)
+	# string features must get the same columns as when the model was trained
+	stats = lr.stats or {}
+	dataset = Dataset(path, encoding=stats.get('encoding', "codes"))
+	dataset.select_features(lr.selected_features, categories=stats.get('categories'))
+	# scaled like the rows the thetas were trained on; models saved before
+	# the stats were kept can only be scaled with this batch's own
+	if lr.stats is None:
+		print("no preprocessing stats saved with the model, scaling the new rows on their own...")
+		mapping = dataset.prepare_data(dtype)
+	else:
+		mapping = dataset.prepare_data_with_stats(lr.stats, dtype)
+	X, y = dataset.get_data()
+	# labels of this batch in the saved model's encoding
+	reverse_mapping = {house: i for i, house in lr.mapping.items()}
+	y = np.array([reverse_mapping[mapping[label]] for label in y])
+	lr.partial_fit(X, y)
+	print(f"Precision on the new rows: {lr.precision(y, lr.predict(X))}")
+	with profiler.section("save"):
+		lr.save_thetas()
+	print(f"Model updated! The thetas are saved in the {lr.model_file('thetas.csv')} file.")
+
+# One --parallel model in a worker process. The data are read-only views on
+# the parent's shared copy, and the RNG state is the parent's after the
+# split, so the model is the one a single run with its optimizer gives
+def train_worker(shared, rng_state, settings, fit_options):
+	np.random.set_state(rng_state)
+	X_train, X_test, y_train, y_test = shared.get_train_test_data()
+	lr = LogisticRegression(**settings)
+	lr.fit(X_train, y_train, plot=False, **fit_options)
+	return np.mean(lr.predict(X_test) == y_test)
+
+# --parallel gd,adam,...: one model per optimizer, trained at the same time in
+# worker processes that attach to one shared copy of the prepared data
+# instead of each parsing the CSV; each is saved in <--model-dir>/<optimizer>
+def parallel_train(dataset, settings, fit_options):
+	shared = dataset.share(test_size=0.2)
+	try:
+		rng_state = np.random.get_state()
+		with ProcessPoolExecutor(min(len(settings), os.cpu_count())) as executor:
+			futures = [executor.submit(train_worker, shared, rng_state, model_settings, fit_options)
+				for model_settings in settings]
+			for model_settings, future in zip(settings, futures):
+				try:
+					print(f"{model_settings['optimizer']:12} precision {future.result():.4f}, saved in {model_settings['model_dir']}")
+				except ValueError as e:
+					print(f"{model_settings['optimizer']:12} Error: {e}")
+	finally:
+		shared.close()
 
 def main():
 	np.random.seed(42)
@@ -25,35 +109,74 @@ def main():
 		selected_features = [6, 7, 8, 5, 9, 10, 11, 12, 13] #Precision: Precision: Precision: 0.98125
 		# selected_features = [4,5,6,8,11,12,13,14] #Precision: Precision: Precision: 0.98125
 		# selected_features = [5, 6, 7, 8, 5, 9, 10, 11, 12] #Precision: Precision: 0.9777777777777777
-		dataset = Dataset(sys.argv[1])
+		options = parse_options(sys.argv)
+		if options is None:
+			print(USAGE)
+			return
+		# --features 6,7,8 trains another feature set, e.g. to compare it with
+		# logreg_score.py against a model saved in another --model-dir
+		if options["--features"]:
+			selected_features = options["--features"]
+		dtype = np.float32 if "--float32" in sys.argv else np.float64
+		if "--partial" in sys.argv:
+			partial_train(sys.argv[1], dtype, options["--model-dir"])
+			return
+		# string features (names, birthday, best hand) as category codes, or
+		# with --onehot as one sparse 0/1 column per value
+		dataset = Dataset(sys.argv[1], encoding="onehot" if "--onehot" in sys.argv else "codes")
 		dataset.select_features(selected_features, use_hands=False)
-		mapping = dataset.prepare_data()
-		X_train, X_test, y_train, y_test= dataset.get_train_test_data(test_size=0.2)
+		mapping = dataset.prepare_data(dtype)
 		# stochastic = True if len(sys.argv) == 3 and sys.argv[2] == "--stochastic" else False
 		stochastic = True if "--stochastic" in sys.argv else False
 		schedule_lr = True if "--schedule_lr" in sys.argv else False
-		num_iter = 100 if stochastic else 20000
-		lr = 0.005 if stochastic else 0.003
-		lr = LogisticRegression(mapping=mapping, lr=lr, num_iter=num_iter, selected_features=selected_features)
-		lr.fit(X_train, y_train, stochastic=stochastic, schedule_lr=schedule_lr)
+		warm_start = True if "--warm-start" in sys.argv else False
+		resume = True if "--resume" in sys.argv else False
+		verbose = True if "--verbose" in sys.argv else False
+		optimizers = options["--parallel"].split(",") if options["--parallel"] else [options["--optimizer"]]
+		if any(optimizer not in OPTIMIZERS for optimizer in optimizers) or options["--schedule"] not in (None, *SCHEDULES):
+			print(f"Unknown optimizer or schedule, expected one of {', '.join(OPTIMIZERS)} and {', '.join(SCHEDULES)}")
+			return
+		num_iter = options["--iterations"] or (100 if stochastic else 20000)
+		# checkpoint.npz every N iterations (GD) or epochs (SGD), 0 to disable
+		checkpoint_every = options["--checkpoint"]
+		if checkpoint_every is None:
+			checkpoint_every = 10 if stochastic else 1000
+		# a warm start is already close, stop each class once the cost settles
+		tol = 1e-5 if warm_start else None
+		settings = [dict(mapping=mapping, lr=options["--lr"] or (stochastic and STOCHASTIC_LR.get(optimizer))
+			or OPTIMIZER_LR.get(optimizer, 0.005 if stochastic else 0.003),
+			num_iter=num_iter, selected_features=selected_features, tol=tol, stats=dataset.stats, dtype=dtype,
+			optimizer=optimizer, schedule=options["--schedule"], checkpoint_every=checkpoint_every,
+			model_dir=os.path.join(options["--model-dir"], optimizer) if options["--parallel"] else options["--model-dir"])
+			for optimizer in optimizers]
+		fit_options = dict(stochastic=stochastic, schedule_lr=schedule_lr, warm_start=warm_start, resume=resume)
+		if options["--parallel"]:
+			parallel_train(dataset, settings, fit_options)
+			return
+		X_train, X_test, y_train, y_test= dataset.get_train_test_data(test_size=0.2)
+		lr = LogisticRegression(**settings[0])
+		try:
+			lr.fit(X_train, y_train, **fit_options)
+		except ValueError as e:
+			print(f"Error: {e}")
+			return
 		preds = lr.predict(X_test)
-		confusion_matrix(y_test, preds, lr)
-		count = 0
-		for i in range(len(preds)):
-			if lr.unique_labels[preds[i]] != lr.unique_labels[y_test[i]]:
-				count += 1
-				print(f"Predicted: {lr.mapping[lr.unique_labels[preds[i]]]} Actual: {lr.mapping[lr.unique_labels[y_test[i]]]}")
-			
-		print(f"Total wrong predictions: {count} out of {len(preds)}")
-		print(f"Precision: {lr.precision(y_test, preds)}")
-
-		print("Training done! The thetas are saved in the thetas.csv file.")
-		lr.save_thetas()
+		with profiler.section("metrics"):
+			matrix = confusion_matrix(y_test, preds, len(lr.unique_labels))
+			class_names = [lr.mapping[label] for label in lr.unique_labels]
+			if verbose:
+				print_mismatches(y_test, preds, class_names)
+			print_report(matrix, class_names)
+			print(f"Precision: {accuracy(matrix)}")
+
+		print(f"Training done! The thetas are saved in the {lr.model_file('thetas.csv')} file.")
+		with profiler.section("save"):
+			lr.save_thetas()
 	else:
-		print("Usage: python logreg_train.py path/to/dataset.csv --stochastic(optional)")
+		print(USAGE)
 
 if __name__ == "__main__":
-	main()
+	profiler.run(main, "logreg_train", "--profile" in sys.argv, "--cprofile" in sys.argv)
 
 
 	
\ No newline at end of file
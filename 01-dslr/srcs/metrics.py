@@ -0,0 +1,44 @@
+# Classification metrics shared by logreg_train and logreg_predict.
+# Labels are class indices 0..num_classes-1; everything is vectorized.
+import numpy as np
+
+# rows: actual class, columns: predicted class
+def confusion_matrix(y_true, y_pred, num_classes):
+	y_true = np.asarray(y_true, dtype=np.intp)
+	y_pred = np.asarray(y_pred, dtype=np.intp)
+	counts = np.bincount(y_true * num_classes + y_pred, minlength=num_classes * num_classes)
+	return counts.reshape(num_classes, num_classes)
+
+def accuracy(matrix):
+	total = matrix.sum()
+	return np.trace(matrix) / total if total else 0.0
+
+# per-class precision, recall, F1 and support (0 where undefined)
+def class_stats(matrix):
+	tp = np.diag(matrix).astype(float)
+	support = matrix.sum(axis=1)
+	predicted = matrix.sum(axis=0)
+	precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+	recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+	denominator = precision + recall
+	f1 = np.divide(2 * precision * recall, denominator, out=np.zeros_like(tp), where=denominator > 0)
+	return precision, recall, f1, support
+
+def print_report(matrix, class_names):
+	print("Confusion matrix rows: Actual, columns: Predicted")
+	print(matrix)
+	precision, recall, f1, support = class_stats(matrix)
+	width = max(len(name) for name in class_names)
+	print(f"{'':<{width}}  {'samples':>8} {'precision':>10} {'recall':>8} {'f1':>8}")
+	for i, name in enumerate(class_names):
+		print(f"{name:<{width}}  {support[i]:>8} {precision[i]:>10.4f} {recall[i]:>8.4f} {f1[i]:>8.4f}")
+	print(f"Total wrong predictions: {matrix.sum() - np.trace(matrix)} out of {matrix.sum()}")
+
+# one line per misclassified sample, only wanted with --verbose
+def print_mismatches(y_true, y_pred, class_names):
+	y_true = np.asarray(y_true, dtype=np.intp)
+	y_pred = np.asarray(y_pred, dtype=np.intp)
+	names = np.asarray(class_names)
+	wrong = np.flatnonzero(y_true != y_pred)
+	if len(wrong):
+		print("\n".join(f"Predicted: {p} Actual: {a}" for p, a in zip(names[y_pred[wrong]], names[y_true[wrong]])))
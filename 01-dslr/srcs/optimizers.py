@@ -0,0 +1,162 @@
+# Update rules and learning-rate schedules for LogisticRegression.
+# An optimizer keeps its own state (velocity, moments, ...) for one theta and
+# updates it in place with step(theta, grad, lr, cost, loss), grad being the
+# mean gradient at theta. cost and loss (theta -> cost) are only used by the
+# line search, which sets needs_loss. state() returns the optimizer state as
+# named arrays for checkpoints, load_state() puts it back. A schedule maps the
+# iteration (GD) or epoch (SGD) to a learning rate.
+import math
+import numpy as np
+
+class GradientDescent:
+	needs_loss = False
+
+	def step(self, theta, grad, lr, cost=None, loss=None):
+		theta -= lr * grad
+
+	def state(self):
+		return {}
+
+	def load_state(self, state):
+		pass
+
+# v = μv − lr∇J(θ), θ += v
+class Momentum:
+	needs_loss = False
+
+	def __init__(self, mu=0.9):
+		self.mu = mu
+		self.velocity = None
+
+	def step(self, theta, grad, lr, cost=None, loss=None):
+		if self.velocity is None:
+			self.velocity = np.zeros_like(theta)
+		self.velocity *= self.mu
+		self.velocity -= lr * grad
+		theta += self.velocity
+
+	def state(self):
+		return {} if self.velocity is None else {"velocity": self.velocity}
+
+	def load_state(self, state):
+		self.velocity = state.get("velocity")
+
+# Nesterov momentum written on the look-ahead point, so the gradient is still
+# taken at theta: v = μv − lr∇J(θ), θ += μv − lr∇J(θ)
+class Nesterov(Momentum):
+	def step(self, theta, grad, lr, cost=None, loss=None):
+		if self.velocity is None:
+			self.velocity = np.zeros_like(theta)
+		self.velocity *= self.mu
+		self.velocity -= lr * grad
+		theta += self.mu * self.velocity - lr * grad
+
+class Adam:
+	needs_loss = False
+
+	def __init__(self, beta1=0.9, beta2=0.999, eps=1e-8):
+		self.beta1 = beta1
+		self.beta2 = beta2
+		self.eps = eps
+		self.t = 0
+		self.m = None
+		self.v = None
+
+	def step(self, theta, grad, lr, cost=None, loss=None):
+		if self.m is None:
+			self.m = np.zeros_like(theta)
+			self.v = np.zeros_like(theta)
+		self.t += 1
+		self.m *= self.beta1
+		self.m += (1 - self.beta1) * grad
+		self.v *= self.beta2
+		self.v += (1 - self.beta2) * grad * grad
+		m_hat = self.m / (1 - self.beta1 ** self.t)
+		v_hat = self.v / (1 - self.beta2 ** self.t)
+		theta -= lr * m_hat / (np.sqrt(v_hat) + self.eps)
+
+	def state(self):
+		return {} if self.m is None else {"t": np.array(self.t), "m": self.m, "v": self.v}
+
+	def load_state(self, state):
+		if "m" in state:
+			self.t, self.m, self.v = int(state["t"]), state["m"], state["v"]
+
+# Backtracking (Armijo) line search: from the last accepted step times grow,
+# halve the step until J(θ − t∇J) <= J(θ) − c t ||∇J||². lr is the first
+# step tried and the largest one: on one SGD sample the check passes almost
+# always, and an uncapped step would grow until θ overflows. The schedule
+# does not apply
+class LineSearch:
+	needs_loss = True
+
+	def __init__(self, shrink=0.5, c=1e-4, grow=2.0, max_halvings=30):
+		self.shrink = shrink
+		self.c = c
+		self.grow = grow
+		self.max_halvings = max_halvings
+		self.t = None
+
+	def step(self, theta, grad, lr, cost=None, loss=None):
+		if loss is None:
+			raise ValueError("line search needs the cost function")
+		t = lr if self.t is None else min(self.t * self.grow, lr)
+		if cost is None:
+			cost = loss(theta)
+		sq_norm = float(grad @ grad)
+		for _ in range(self.max_halvings):
+			if loss(theta - t * grad) <= cost - self.c * t * sq_norm:
+				break
+			t *= self.shrink
+		self.t = t
+		theta -= t * grad
+
+	def state(self):
+		return {} if self.t is None else {"t": np.array(self.t)}
+
+	def load_state(self, state):
+		if "t" in state:
+			self.t = float(state["t"])
+
+OPTIMIZERS = {
+	"gd": GradientDescent,
+	"momentum": Momentum,
+	"nesterov": Nesterov,
+	"adam": Adam,
+	"line_search": LineSearch,
+}
+
+def make_optimizer(name):
+	if name not in OPTIMIZERS:
+		raise ValueError(f"unknown optimizer {name!r}, expected one of {', '.join(OPTIMIZERS)}")
+	return OPTIMIZERS[name]()
+
+# lr0 for every iteration
+def constant(lr, num_iter):
+	return lambda i: lr
+
+# lr0 divided by 10 at every quarter of the run
+def step_decay(lr, num_iter, drop=0.1, steps=4):
+	every = max(num_iter // steps, 1)
+	return lambda i: lr * drop ** (i // every)
+
+# From lr0 down to 0 along half a cosine over the run
+def cosine(lr, num_iter):
+	return lambda i: lr * 0.5 * (1 + math.cos(math.pi * i / num_iter))
+
+# lr0 / (1 + decay·i): the decay the old schedule_lr was meant to be, without
+# compounding the factor every epoch
+def inverse_time(lr, num_iter, decay=0.05):
+	return lambda i: lr / (1 + decay * i)
+
+SCHEDULES = {
+	"constant": constant,
+	"step": step_decay,
+	"cosine": cosine,
+	"inverse_time": inverse_time,
+}
+
+def make_schedule(name, lr, num_iter):
+	if name not in SCHEDULES:
+		raise ValueError(f"unknown schedule {name!r}, expected one of {', '.join(SCHEDULES)}")
+	return SCHEDULES[name](lr, num_iter)
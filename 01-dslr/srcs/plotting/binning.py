@@ -0,0 +1,91 @@
+# Binning shared by the plotting tools: every column is binned once into
+# integer codes over its own edges, and rows are grouped by house once, so a
+# histogram of any column or pair of columns is a single np.bincount.
+
+import numpy as np
+
+HOUSE = 'Hogwarts House'
+
+def numeric_columns(df):
+	# the house column reads as float when it is all empty, as in the test set
+	return [col for col in df.select_dtypes(include='number').columns if col not in ('Index', HOUSE)]
+
+# House code of every row and the house names; rows without a house (the test
+# set) all go to one 'Unknown' group
+def house_codes(df):
+	houses = df[HOUSE]
+	names = sorted(houses.dropna().unique())
+	codes = houses.map({name: i for i, name in enumerate(names)})
+	if codes.isna().any():
+		codes = codes.fillna(len(names))
+		names.append('Unknown')
+	return codes.to_numpy(dtype=np.intp), names
+
+# Bin code of every value over bins equal-width bins from the column min to
+# max, -1 for NaN. The last edge is closed like in np.histogram
+def bin_codes(values, bins):
+	values = np.asarray(values, dtype=np.float64)
+	valid = ~np.isnan(values)
+	if not valid.any():
+		return np.full(len(values), -1, dtype=np.intp), np.linspace(0, 1, bins + 1)
+	low, high = values[valid].min(), values[valid].max()
+	if low == high:
+		low, high = low - 0.5, high + 0.5
+	edges = np.linspace(low, high, bins + 1)
+	codes = np.full(len(values), -1, dtype=np.intp)
+	scaled = (values[valid] - low) * (bins / (high - low))
+	codes[valid] = np.minimum(scaled.astype(np.intp), bins - 1)
+	return codes, edges
+
+# Counts of shape (houses, bins) of one column
+def histogram_counts(codes, houses, n_houses, bins):
+	valid = codes >= 0
+	counts = np.bincount(houses[valid] * bins + codes[valid], minlength=n_houses * bins)
+	return counts.reshape(n_houses, bins)
+
+# Counts of shape (houses, bins, bins) of a pair of columns, x then y
+def pair_counts(x_codes, y_codes, houses, n_houses, bins):
+	valid = (x_codes >= 0) & (y_codes >= 0)
+	flat = (houses[valid] * bins + x_codes[valid]) * bins + y_codes[valid]
+	counts = np.bincount(flat, minlength=n_houses * bins * bins)
+	return counts.reshape(n_houses, bins, bins)
+
+# Per-house histograms of every column over edges shared by all houses,
+# computed on first use and cached, so rendering and scoring a column bin the
+# data only once
+class HouseHistograms:
+	def __init__(self, df, bins=20):
+		self.df = df
+		self.bins = bins
+		self.columns = numeric_columns(df)
+		self.houses, self.names = house_codes(df)
+		self.cache = {}
+
+	# (counts of shape (houses, bins), edges) of one column
+	def __getitem__(self, col):
+		if col not in self.cache:
+			codes, edges = bin_codes(self.df[col], self.bins)
+			self.cache[col] = (histogram_counts(codes, self.houses, len(self.names), self.bins), edges)
+		return self.cache[col]
+
+	# 1 - the Jensen-Shannon divergence of the houses' score distributions,
+	# mean_i KL(p_i || M) with M their average, scaled by its maximum log2(k):
+	# 1 when every house has the same distribution, 0 when no two overlap.
+	# Students without a house are left out; nan if fewer than two houses
+	def homogeneity(self, col):
+		counts, _ = self[col]
+		counts = counts[[i for i, name in enumerate(self.names) if name != 'Unknown']]
+		counts = counts[counts.sum(axis=1) > 0]
+		if len(counts) < 2:
+			return float('nan')
+		p = counts / counts.sum(axis=1, keepdims=True)
+		m = p.mean(axis=0)
+		with np.errstate(divide='ignore', invalid='ignore'):
+			kl = np.where(p > 0, p * np.log2(p / m), 0).sum(axis=1)
+		return float(1 - kl.mean() / np.log2(len(p)))
+
+	# Courses from the most to the least homogeneous
+	def homogeneity_scores(self):
+		scores = {col: self.homogeneity(col) for col in self.columns}
+		# nan (no houses to compare) sorts last
+		return dict(sorted(scores.items(), key=lambda item: -item[1] if item[1] == item[1] else np.inf))
@@ -6,43 +6,62 @@
 
 import pandas as pd
 import matplotlib.pyplot as plt
+import math
+import os
 import sys
 
-def histogram(df):
-
-	numeric_cols = []
-	for col in df.columns:
-		if df[col].dtype == 'float64' or df[col].dtype == 'int64':
-			numeric_cols.append(col)
-	
-	houses = df['Hogwarts House'].unique()
-	plt.figure(figsize=(20, 20))
-	for col in numeric_cols:
-		plt.subplot(len(numeric_cols)//2, 2, numeric_cols.index(col)+1)
-		plt.subplots_adjust(hspace=1)
-		plt.title(col)
-		for house in houses:
-			plt.hist(df[df['Hogwarts House'] == house][col], alpha=0.5, label=house, bins=20)
-		plt.legend()
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from binning import HouseHistograms
+
+# The houses are binned once per course over shared edges (see binning.py)
+# and drawn from those counts; each title carries the course's homogeneity
+def histogram(df, bins=20):
+	histograms = HouseHistograms(df, bins)
+	scores = histograms.homogeneity_scores()
+	cols = histograms.columns
+	fig, axes = plt.subplots(math.ceil(len(cols) / 2), 2, figsize=(20, 20), squeeze=False)
+	plt.subplots_adjust(hspace=1)
+	for ax, col in zip(axes.flat, cols):
+		counts, edges = histograms[col]
+		ax.set_title(f"{col} (homogeneity {scores[col]:.3f})")
+		for house, name in enumerate(histograms.names):
+			ax.stairs(counts[house], edges, fill=True, alpha=0.5, label=name)
+		ax.legend()
+	for ax in axes.flat[len(cols):]:
+		ax.set_visible(False)
 	plt.savefig(f"srcs/plotting/plots/histogram.png")
 	plt.close()
-	
+	print_scores(scores)
+
+def print_scores(scores):
+	print("Homogeneity of the score distribution between the houses (1 = identical):")
+	for col, score in scores.items():
+		print(f"  {col:30} {score:.4f}")
+	best = next(iter(scores), None)
+	if best is None or scores[best] != scores[best]:
+		print("No houses to compare in this dataset.")
+	else:
+		print(f"Most homogeneous course: {best}")
 
 if __name__ == "__main__":
-	if len(sys.argv) == 2:
+	scores_only = "--scores" in sys.argv
+	args = [arg for arg in sys.argv[1:] if arg != "--scores"]
+	if len(args) == 1:
 		
 		try:
-			df = pd.read_csv(sys.argv[1])
+			df = pd.read_csv(args[0])
 		except FileNotFoundError:
 			print("File not found")
 			exit()
 		except Exception as e:
 			print("Error: ", e)
 			exit()
-		histogram(df)
+		if scores_only:
+			print_scores(HouseHistograms(df).homogeneity_scores())
+		else:
+			histogram(df)
 
 	else:
-		print("Usage: python histogram.py path/to/dataset.csv")
+		print("Usage: python histogram.py path/to/dataset.csv --scores(optional)")
 
 					
-
@@ -1,25 +1,84 @@
 import pandas as pd
-import seaborn as sns
+import numpy as np
 import matplotlib.pyplot as plt
+from concurrent.futures import ThreadPoolExecutor
+import os
 import sys
-	
-def pair_plot(dataset):
-	#  change color palette
-	sns.pairplot(dataset, kind='scatter', hue='Hogwarts House', palette='husl', markers=["o", "s", "D", "X"])
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from binning import numeric_columns, house_codes, bin_codes, histogram_counts, pair_counts
+
+# Pair plot drawn from binned counts instead of one marker per student: each
+# off-diagonal panel is a 2D histogram where a cell takes the colors of the
+# houses in it, mixed by count, and its opacity grows with the log of the
+# count; the diagonal has one histogram per house. The cost depends on the
+# number of bins, not of rows, so large datasets render in seconds.
+def pair_plot(dataset, bins=40, lower=False, workers=None):
+	cols = numeric_columns(dataset)
+	houses, names = house_codes(dataset)
+	n = len(cols)
+	colors = np.array([plt.get_cmap('tab10')(i)[:3] for i in range(len(names))])
+	if names[-1] == 'Unknown':
+		colors[-1] = (0.5, 0.5, 0.5)
+	binned = [bin_codes(dataset[col], bins) for col in cols]
+	pairs = [(i, j) for i in range(n) for j in range(n) if i != j and (i > j or not lower)]
+
+	# panel (i, j) has column j on x and column i on y
+	def panel(pair):
+		i, j = pair
+		return pair_counts(binned[j][0], binned[i][0], houses, len(names), bins)
+	with ThreadPoolExecutor(workers or os.cpu_count()) as executor:
+		counts = dict(zip(pairs, executor.map(panel, pairs)))
+
+	fig, axes = plt.subplots(n, n, figsize=(2 * n, 2 * n), squeeze=False)
+	fig.subplots_adjust(wspace=0.05, hspace=0.05)
+	for i in range(n):
+		for j in range(n):
+			ax = axes[i, j]
+			x_edges, y_edges = binned[j][1], binned[i][1]
+			if i == j:
+				diagonal = histogram_counts(binned[i][0], houses, len(names), bins)
+				for h, name in enumerate(names):
+					ax.stairs(diagonal[h], x_edges, color=colors[h], label=name)
+			elif (i, j) in counts:
+				ax.imshow(to_rgba(counts[(i, j)], colors), origin='lower', aspect='auto', interpolation='nearest',
+					extent=(x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]))
+			else:
+				ax.set_visible(False)
+				continue
+			ax.set_xticks([])
+			ax.set_yticks([])
+			if i == n - 1:
+				ax.set_xlabel(cols[j], fontsize=7, rotation=45, ha='right')
+			if j == 0:
+				ax.set_ylabel(cols[i], fontsize=7, rotation=45, ha='right')
+	axes[0, 0].legend(loc='upper left', bbox_to_anchor=(0, 1.6), ncol=len(names), fontsize=8, frameon=False)
+	plt.savefig(f"srcs/plotting/plots/pair_plot.png", dpi=80, bbox_inches='tight')
 	plt.show()
-	plt.savefig(f"srcs/plotting/plots/pair_plot.png")
 	plt.close()
 
+# (houses, bins, bins) counts -> (bins, bins, 4) image with y on the rows
+def to_rgba(counts, colors):
+	total = counts.sum(axis=0)
+	rgba = np.zeros(total.shape + (4,))
+	filled = total > 0
+	rgba[..., :3] = np.tensordot(counts, colors, axes=(0, 0))
+	rgba[filled, :3] /= total[filled, None]
+	rgba[..., 3] = np.log1p(total) / np.log1p(max(total.max(), 1))
+	return rgba.transpose(1, 0, 2)
+
 if __name__ == "__main__":
-	if len(sys.argv) == 2:
+	lower = "--lower" in sys.argv
+	args = [arg for arg in sys.argv[1:] if arg != "--lower"]
+	if len(args) == 1:
 		try:
-			df = pd.read_csv(sys.argv[1])
+			df = pd.read_csv(args[0])
 		except FileNotFoundError:
 			print("File not found")
 			exit()
 		except Exception as e:
 			print("Error: ", e)
 			exit()
-		pair_plot(df)
+		pair_plot(df, lower=lower)
 	else:
-		print("Usage: python pair_plot.py path/to/dataset.csv")
\ No newline at end of file
+		print("Usage: python pair_plot.py path/to/dataset.csv --lower(optional)")
@@ -0,0 +1,81 @@
+# Prepared X and y published once as memory-mapped .npy files, so training
+# processes map the same pages instead of each parsing the CSV and holding its
+# own copy. The files go to /dev/shm when it exists, a RAM-backed filesystem,
+# so nothing is written to disk. The parent creates them with publish() and
+# deletes them with close(). A SharedDataset pickles to its directory only,
+# so it can be passed to workers, which open read-only views with np.load.
+# Memory-mapped files rather than multiprocessing.shared_memory: before
+# Python 3.13 every process attaching a block registers it with a resource
+# tracker that may unlink it when that process exits.
+import os
+import shutil
+import tempfile
+import numpy as np
+from sparse import CSRMatrix
+
+class SharedDataset:
+	def __init__(self, directory, x_shape, n_test=0):
+		self.directory = directory
+		self.x_shape = x_shape
+		# the first n_test rows are the test set
+		self.n_test = n_test
+		self.owner = False
+
+	# x is a dense array or a CSRMatrix, stored as its data, indices and indptr
+	@classmethod
+	def publish(cls, x, y, n_test=0):
+		if isinstance(x, CSRMatrix):
+			arrays = {"x_data": x.data, "x_indices": x.indices, "x_indptr": x.indptr}
+		else:
+			arrays = {"x": x}
+		arrays["y"] = y
+		root = "/dev/shm" if os.path.isdir("/dev/shm") else None
+		shared = cls(tempfile.mkdtemp(prefix="dslr_", dir=root), tuple(x.shape), n_test)
+		shared.owner = True
+		try:
+			for name, array in arrays.items():
+				np.save(shared.path(name), np.ascontiguousarray(array))
+		except BaseException:
+			shared.close()
+			raise
+		return shared
+
+	def __getstate__(self):
+		return {"directory": self.directory, "x_shape": self.x_shape, "n_test": self.n_test}
+
+	def __setstate__(self, state):
+		self.__init__(state["directory"], state["x_shape"], state["n_test"])
+
+	def path(self, name):
+		return os.path.join(self.directory, name + ".npy")
+
+	def array(self, name):
+		return np.load(self.path(name), mmap_mode="r")
+
+	# X and y as read-only views; a sparse X only gets its row index array
+	# rebuilt in this process
+	def get_data(self):
+		if os.path.exists(self.path("x")):
+			x = self.array("x")
+		else:
+			x = CSRMatrix(self.array("x_data"), self.array("x_indices"), self.array("x_indptr"), self.x_shape)
+		return x, self.array("y")
+
+	# The split made by Dataset.share, as views like get_data
+	def get_train_test_data(self):
+		x, y = self.get_data()
+		n = self.n_test
+		return x[n:], x[:n], y[n:], y[:n]
+
+	# The owner deletes the files; views already open stay valid until
+	# they are dropped
+	def close(self):
+		if self.owner:
+			shutil.rmtree(self.directory, ignore_errors=True)
+			self.owner = False
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, *exc):
+		self.close()
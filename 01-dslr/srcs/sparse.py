@@ -0,0 +1,101 @@
+# Minimal CSR sparse matrix on NumPy arrays, for one-hot encoded categorical
+# features: row i holds the values data[indptr[i]:indptr[i + 1]] at the
+# columns indices[indptr[i]:indptr[i + 1]]. It has what LogisticRegression
+# uses: X @ θ, X.T @ r, X.shape and row selection, each O(stored values)
+# through np.bincount instead of O(rows x columns).
+import numpy as np
+
+class CSRMatrix:
+	def __init__(self, data, indices, indptr, shape):
+		self.data = data
+		self.indices = indices
+		self.indptr = indptr
+		self.shape = tuple(int(n) for n in shape)
+		# row of every stored value
+		self.rows = np.repeat(np.arange(self.shape[0]), np.diff(indptr))
+
+	@property
+	def dtype(self):
+		return self.data.dtype
+
+	@property
+	def T(self):
+		return Transposed(self)
+
+	def __len__(self):
+		return self.shape[0]
+
+	@classmethod
+	def from_dense(cls, x):
+		x = np.asarray(x)
+		rows, cols = np.nonzero(x)
+		indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=x.shape[0]))))
+		return cls(x[rows, cols], cols, indptr, x.shape)
+
+	# One 0/1 column per category; a code of -1 (missing) is an empty row
+	@classmethod
+	def one_hot(cls, codes, n_categories, dtype=np.float64):
+		codes = np.asarray(codes, dtype=np.intp)
+		present = codes >= 0
+		indptr = np.concatenate(([0], np.cumsum(present)))
+		return cls(np.ones(int(present.sum()), dtype=dtype), codes[present], indptr, (len(codes), n_categories))
+
+	# Side by side blocks, dense arrays or CSRMatrix, with the same rows
+	@classmethod
+	def hstack(cls, blocks):
+		blocks = [block if isinstance(block, CSRMatrix) else cls.from_dense(block) for block in blocks]
+		offsets = np.cumsum([0] + [block.shape[1] for block in blocks])
+		rows = np.concatenate([block.rows for block in blocks])
+		# stable: each block is sorted by row then column and comes after
+		# the blocks on its left, so columns stay sorted within a row
+		order = np.argsort(rows, kind='stable')
+		data = np.concatenate([block.data for block in blocks])[order]
+		indices = np.concatenate([block.indices + offset for block, offset in zip(blocks, offsets)])[order]
+		indptr = np.concatenate(([0], np.cumsum(np.bincount(rows, minlength=blocks[0].shape[0]))))
+		return cls(data, indices, indptr, (blocks[0].shape[0], offsets[-1]))
+
+	def astype(self, dtype):
+		return CSRMatrix(self.data.astype(dtype), self.indices, self.indptr, self.shape)
+
+	def toarray(self):
+		x = np.zeros(self.shape, dtype=self.dtype)
+		x[self.rows, self.indices] = self.data
+		return x
+
+	# Rows by int, slice or index array, always as a CSRMatrix; contiguous
+	# slices (one SGD sample) are taken without touching the other rows
+	def __getitem__(self, key):
+		if isinstance(key, tuple):
+			key = key[0]
+		if isinstance(key, slice) and key.step in (None, 1):
+			start, stop, _ = key.indices(self.shape[0])
+			stop = max(start, stop)
+			low, high = self.indptr[start], self.indptr[stop]
+			return CSRMatrix(self.data[low:high], self.indices[low:high],
+				self.indptr[start:stop + 1] - low, (stop - start, self.shape[1]))
+		selected = np.atleast_1d(np.arange(self.shape[0])[key])
+		lengths = np.diff(self.indptr)[selected]
+		indptr = np.concatenate(([0], np.cumsum(lengths)))
+		positions = np.repeat(self.indptr[selected] - indptr[:-1], lengths) + np.arange(indptr[-1])
+		return CSRMatrix(self.data[positions], self.indices[positions], indptr, (len(selected), self.shape[1]))
+
+	def __matmul__(self, other):
+		other = np.asarray(other)
+		dtype = np.result_type(self.data, other)
+		if other.ndim == 1:
+			return np.bincount(self.rows, weights=self.data * other[self.indices], minlength=self.shape[0]).astype(dtype)
+		out = np.zeros((self.shape[0], other.shape[1]), dtype=dtype)
+		np.add.at(out, self.rows, self.data[:, None] * other[self.indices])
+		return out
+
+# X.T of a CSRMatrix, only for X.T @ r
+class Transposed:
+	def __init__(self, matrix):
+		self.matrix = matrix
+		self.shape = matrix.shape[::-1]
+
+	def __matmul__(self, other):
+		x = self.matrix
+		other = np.asarray(other)
+		dtype = np.result_type(x.data, other)
+		return np.bincount(x.indices, weights=x.data * other[x.rows], minlength=x.shape[1]).astype(dtype)
@@ -0,0 +1,61 @@
+# Throughput of Polynomial.evaluate and of solve(verify=True).
+# Run from 02-computorv1: python3 -m benchmarks.bench_evaluate [n_points]
+import sys
+import time
+
+from srcs.equation import Equation
+from srcs.polynomial import Polynomial, np
+
+EQUATIONS = [
+    "5 * X^0 = 4 * X^0 + 7 * X^1",
+    "6 * X^0 + 11 * X^1 + 5 * X^2 = 1 * X^0 + 1 * X^1",
+    "5 * X^0 + 13 * X^1 + 3 * X^2 = 1 * X^0 + 1 * X^1",
+    "5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0",
+    "5.0x² + 10.0 * X = 0",
+]
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - start
+
+
+def bench_evaluate(n_points: int):
+    polynomial = Polynomial([1.5, -3.0, 0.25, 2.0, -1.0])
+    print(f"Evaluating a degree {polynomial.degree} polynomial")
+
+    n_python = min(n_points, 200_000)
+    xs = [i / n_python for i in range(n_python)]
+    _, elapsed = timed(polynomial.evaluate, xs)
+    print(f"  python list  : {n_python:>10} points {n_python / elapsed:>14,.0f} points/s")
+
+    if np is None:
+        print("  numpy array  : skipped, numpy is not installed")
+        return
+    xs = np.linspace(-10.0, 10.0, n_points)
+    _, elapsed = timed(polynomial.evaluate, xs)
+    print(f"  numpy array  : {n_points:>10} points {n_points / elapsed:>14,.0f} points/s")
+
+
+def bench_verify(n_rounds: int):
+    print("Solving the sample equations")
+    for verify in (False, True):
+        start = time.perf_counter()
+        worst = 0.0
+        for _ in range(n_rounds):
+            for equation_str in EQUATIONS:
+                polynomial = Equation(equation_str).polynomial
+                polynomial.solve(verify=verify)
+                if polynomial.residual is not None:
+                    worst = max(worst, polynomial.residual)
+        elapsed = time.perf_counter() - start
+        solved = n_rounds * len(EQUATIONS)
+        label = "verify=True " if verify else "verify=False"
+        print(f"  {label} : {solved / elapsed:>14,.0f} equations/s, max residual {worst:.3e}")
+
+
+if __name__ == "__main__":
+    n_points = int(sys.argv[1]) if len(sys.argv) > 1 else 5_000_000
+    bench_evaluate(n_points)
+    bench_verify(2000)
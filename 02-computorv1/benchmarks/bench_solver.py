@@ -0,0 +1,89 @@
+# Times the parser, Equation and Polynomial.solve separately on random
+# equations, reports allocations with tracemalloc, and checks every result
+# against the reference solver.
+# Run from 02-computorv1:
+#   python3 -m benchmarks.bench_solver [n_equations] [n_terms] [max_degree] [seed]
+import sys
+import time
+import tracemalloc
+from fractions import Fraction
+
+from srcs.equation import Equation
+from srcs.exceptions import DegreeError
+from srcs.parser import PolynomialParser
+from .generator import random_equations
+from .reference import DEGREE, reference_solve, same_outcome
+
+
+def measure(name: str, func, items):
+    """Run func over items, once timed and once under tracemalloc"""
+    start = time.perf_counter()
+    results = [func(item) for item in items]
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    kept = [func(item) for item in items]
+    after = tracemalloc.take_snapshot()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    blocks = sum(stat.count_diff for stat in after.compare_to(before, "filename"))
+    del kept
+
+    print(f"  {name:<24} {len(items) / elapsed:>12,.0f} ops/s"
+          f"  peak {peak / 1024:>9,.1f} KiB  live blocks {blocks / len(items):>6.1f}/op")
+    return results
+
+
+def parse_both_sides(equation_str: str):
+    left, right = equation_str.split("=")
+    return PolynomialParser.parse_expression(left, True), PolynomialParser.parse_expression(right, True)
+
+
+def solve(polynomial):
+    try:
+        return polynomial.solve()[0]
+    except DegreeError:
+        return DEGREE
+
+
+def as_fraction(value) -> Fraction:
+    """Project Fraction (or int) to a standard library Fraction"""
+    return Fraction(value.numerator, value.denominator)
+
+
+def check(cases, equations, solutions) -> int:
+    """Compare reduced forms and solutions with the reference, return failures"""
+    failures = 0
+    for (equation_str, coefficients), equation, solution in zip(cases, equations, solutions):
+        degree, expected = reference_solve(coefficients)
+        polynomial = equation.polynomial
+        same_coefficients = all(as_fraction(polynomial.coefficient(d)) == coefficients.get(d, 0)
+                                for d in range(max(polynomial.degree, degree) + 1))
+        if not same_coefficients or polynomial.degree != degree or not same_outcome(expected, solution):
+            failures += 1
+            if failures <= 10:
+                print(f"  MISMATCH {equation_str!r}: got {solution!r}, expected {expected!r}")
+    return failures
+
+
+def main():
+    args = [int(arg) for arg in sys.argv[1:]]
+    n_equations, n_terms, max_degree, seed = args + [20000, 4, 2, 42][len(args):]
+
+    cases = random_equations(n_equations, n_terms, max_degree, seed)
+    equation_strs = [equation_str for equation_str, _ in cases]
+    print(f"{n_equations} equations, up to {n_terms} terms per side, degree <= {max_degree}, seed {seed}")
+
+    measure("parse_expression", parse_both_sides, equation_strs)
+    equations = measure("Equation", Equation, equation_strs)
+    solutions = measure("Polynomial.solve", solve, [equation.polynomial for equation in equations])
+
+    failures = check(cases, equations, solutions)
+    print(f"Reference check: {n_equations - failures}/{n_equations} match")
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+# Random well-formed equations in every syntax normalize_input accepts.
+import random
+from fractions import Fraction
+from typing import Dict, List, Tuple
+
+MINUS_SIGNS = ["-", "−"]
+
+
+def _coefficient(rng: random.Random) -> str:
+    """Positive decimal literal, with or without a fractional part"""
+    whole = rng.randint(0, 99)
+    if rng.random() < 0.5:
+        return str(whole)
+    return f"{whole}.{rng.randint(0, 99):0{rng.randint(1, 2)}d}"
+
+
+def _term(rng: random.Random, coef: str, degree: int) -> str:
+    """Write coef * X^degree in one of the accepted forms"""
+    x = rng.choice("Xx")
+    forms = [f"{coef} * {x}^{degree}", f"{coef}*{x}^{degree}", f"{coef}{x}^{degree}"]
+    if degree == 0:
+        forms += [coef]
+    if degree == 1:
+        forms += [f"{coef}{x}", f"{coef} * {x}"]
+    if degree == 2:
+        forms += [f"{coef}{x}²"]
+    if coef == "1":
+        # Missing coefficient
+        forms += [f"{x}^{degree}"]
+        if degree == 1:
+            forms += [x]
+        if degree == 2:
+            forms += [f"{x}²"]
+    return rng.choice(forms)
+
+
+def _side(rng: random.Random, n_terms: int, max_degree: int) -> Tuple[str, Dict[int, Fraction]]:
+    parts: List[str] = []
+    coefficients: Dict[int, Fraction] = {}
+    for i in range(n_terms):
+        degree = rng.randint(0, max_degree)
+        coef = "1" if rng.random() < 0.2 else _coefficient(rng)
+        negative = rng.random() < 0.4
+        term = _term(rng, coef, degree)
+        if negative:
+            sign = rng.choice(MINUS_SIGNS)
+            parts.append(f"{sign} {term}" if i else f"{sign}{term}")
+        else:
+            parts.append(f"+ {term}" if i else term)
+        value = Fraction(coef)
+        coefficients[degree] = coefficients.get(degree, 0) + (-value if negative else value)
+    return " ".join(parts), coefficients
+
+
+def random_equation(rng: random.Random, n_terms: int = 4, max_degree: int = 2) -> Tuple[str, Dict[int, Fraction]]:
+    """Return an equation string and its exact reduced coefficients (left - right)"""
+    left, left_coeffs = _side(rng, rng.randint(1, n_terms), max_degree)
+    if rng.random() < 0.2:
+        right, right_coeffs = "0", {}
+    else:
+        right, right_coeffs = _side(rng, rng.randint(1, n_terms), max_degree)
+    reduced = dict(left_coeffs)
+    for degree, coef in right_coeffs.items():
+        reduced[degree] = reduced.get(degree, 0) - coef
+    return f"{left} = {right}", {d: c for d, c in reduced.items() if c}
+
+
+def random_equations(n: int, n_terms: int = 4, max_degree: int = 2, seed: int = 42) -> List[Tuple[str, Dict[int, Fraction]]]:
+    rng = random.Random(seed)
+    return [random_equation(rng, n_terms, max_degree) for _ in range(n)]
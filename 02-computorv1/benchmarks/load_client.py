@@ -0,0 +1,77 @@
+# Load-testing client for server.py.
+# Run from 02-computorv1 with the service started:
+#   python3 -m benchmarks.load_client [--tcp HOST:PORT | --unix PATH] [clients] [requests_per_client]
+import asyncio
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+from .generator import random_equations
+
+
+async def connect(address: str, value: str):
+    if address == "--unix":
+        return await asyncio.open_unix_connection(value)
+    host, _, port = value.rpartition(":")
+    return await asyncio.open_connection(host or "127.0.0.1", int(port))
+
+
+async def client(address: str, value: str, equations, latencies: list, errors: list):
+    """One connection sending its requests one after the other"""
+    reader, writer = await connect(address, value)
+    for i, equation_str in enumerate(equations):
+        request = json.dumps({"id": i, "equation": equation_str, "steps": True})
+        start = time.perf_counter()
+        writer.write(request.encode() + b"\n")
+        await writer.drain()
+        response = json.loads(await reader.readline())
+        latencies.append(time.perf_counter() - start)
+        if response.get("id") != i:
+            errors.append(f"out of order response {response!r}")
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run(address: str, value: str, n_clients: int, n_requests: int):
+    cases = random_equations(n_clients * n_requests, seed=1)
+    equations = [equation_str for equation_str, _ in cases]
+    latencies, errors = [], []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(address, value, equations[i::n_clients], latencies, errors)
+                           for i in range(n_clients)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    print(f"{n_clients} clients x {n_requests} requests: {len(latencies) / elapsed:,.0f} requests/s")
+    print(f"  latency p50 {statistics.median(latencies) * 1e3:.3f} ms"
+          f"  p99 {latencies[int(len(latencies) * 0.99)] * 1e3:.3f} ms"
+          f"  max {latencies[-1] * 1e3:.3f} ms")
+    if errors:
+        print(f"  {len(errors)} errors, first: {errors[0]}")
+    return equations
+
+
+def spawn_baseline(equations, n: int = 20):
+    """Per-request cost of the old 'python main.py' process spawn"""
+    start = time.perf_counter()
+    for equation_str in equations[:n]:
+        subprocess.run([sys.executable, "main.py", equation_str], capture_output=True, check=False)
+    elapsed = time.perf_counter() - start
+    print(f"  process per request: {n / elapsed:,.1f} requests/s ({elapsed / n * 1e3:.1f} ms each)")
+
+
+def main():
+    args = sys.argv[1:]
+    address, value = ("--tcp", "127.0.0.1:4242")
+    if args and args[0] in ("--tcp", "--unix"):
+        address, value, args = args[0], args[1], args[2:]
+    counts = [int(arg) for arg in args]
+    n_clients, n_requests = counts + [32, 500][len(counts):]
+    equations = asyncio.run(run(address, value, n_clients, n_requests))
+    spawn_baseline(equations)
+
+
+if __name__ == "__main__":
+    main()
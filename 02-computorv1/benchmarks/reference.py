@@ -0,0 +1,39 @@
+# Independent reference solver built on the standard library, used to check
+# the computorv1 results in the benchmarks.
+import math
+from fractions import Fraction
+from typing import Dict, List, Tuple, Union
+
+ALL_REAL = "All real numbers are solutions."
+NO_SOLUTION = "No solution exists."
+NEGATIVE = "No real solutions exist (discriminant is negative)."
+DEGREE = "degree"
+
+
+def reference_solve(coefficients: Dict[int, Fraction]) -> Tuple[int, Union[str, List[float]]]:
+    """Return (degree, outcome) where outcome is a message or the sorted roots"""
+    degree = max(coefficients, default=0)
+    a, b, c = (coefficients.get(d, Fraction(0)) for d in (2, 1, 0))
+    if degree > 2:
+        return degree, DEGREE
+    if degree == 0:
+        return degree, ALL_REAL if c == 0 else NO_SOLUTION
+    if degree == 1:
+        return degree, [float(-c / b)]
+    discriminant = b * b - 4 * a * c
+    if discriminant == 0:
+        return degree, [float(-b / (2 * a))]
+    if discriminant < 0:
+        return degree, NEGATIVE
+    sqrt_disc = math.sqrt(discriminant)
+    return degree, sorted([(-float(b) + sqrt_disc) / (2 * float(a)),
+                           (-float(b) - sqrt_disc) / (2 * float(a))])
+
+
+def same_outcome(expected: Union[str, List[float]], actual, tolerance: float = 1e-9) -> bool:
+    if isinstance(expected, str) or not isinstance(actual, list):
+        return expected == actual
+    if len(expected) != len(actual):
+        return False
+    actual = sorted(float(root) for root in actual)
+    return all(math.isclose(e, a, rel_tol=tolerance, abs_tol=tolerance) for e, a in zip(expected, actual))
@@ -1,20 +1,19 @@
 import sys
 from srcs.equation import Equation
 from srcs.exceptions import ParseError, DegreeError
+from srcs.service import format_root
 
 
-def main():
-    import sys
-    if len(sys.argv) != 2:
-        print("Usage: python main.py \"equation\"")
-        sys.exit(1)
+USAGE = "Usage: python main.py \"equation\" [--verify]\n       python main.py --batch file|- [--verify]"
+
 
+def solve_one(equation_str: str, verify: bool):
     try:
-        equation = Equation(sys.argv[1])
+        equation = Equation(equation_str)
         print(f"Reduced form: {equation.polynomial} = 0")
         print(f"Polynomial degree: {equation.polynomial.degree}")
         
-        solution, steps = equation.polynomial.solve()
+        solution, steps = equation.polynomial.solve(steps=True, verify=verify)
         
         # Display steps if they exist
         if steps:
@@ -32,6 +31,9 @@ def main():
                     print(f"  {sol}")
         else:
             print(solution)
+
+        if equation.polynomial.residual is not None:
+            print(f"Max residual: {equation.polynomial.residual:.3e}")
             
     except ParseError as e:
         print(f"Parse error: {str(e)}")
@@ -40,5 +42,47 @@ def main():
     except Exception as e:
         print(f"Error Check your input: {str(e)}")
 
+
+def solve_batch(path: str, verify: bool):
+    """Solve one equation per line, printing one result line per equation"""
+    stream = sys.stdin if path == "-" else open(path)
+    try:
+        for line in stream:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                polynomial = Equation(line).polynomial
+                solution, _ = polynomial.solve(verify=verify)
+                if isinstance(solution, list):
+                    solution = ", ".join(format_root(sol) for sol in solution)
+                result = f"{line} => {solution}"
+                if polynomial.residual is not None:
+                    result += f" (max residual: {polynomial.residual:.3e})"
+                print(result)
+            except ParseError as e:
+                print(f"{line} => Parse error: {str(e)}")
+            except DegreeError as e:
+                print(f"{line} => {str(e)}")
+            except Exception as e:
+                print(f"{line} => Error Check your input: {str(e)}")
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+
+def main():
+    args = sys.argv[1:]
+    verify = "--verify" in args
+    args = [arg for arg in args if arg != "--verify"]
+
+    if len(args) == 2 and args[0] == "--batch":
+        solve_batch(args[1], verify)
+    elif len(args) == 1:
+        solve_one(args[0], verify)
+    else:
+        print(USAGE)
+        sys.exit(1)
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,93 @@
+# Resident computorv1 solving service.
+#
+# Protocol: newline-delimited JSON over TCP or a Unix socket. Each request is
+# one line {"equation": "...", "steps": true, "verify": false, "id": ...};
+# each response is one line holding the reduced form, degree, steps and
+# solutions (see srcs/service.py), or an "error", echoing "id" if given.
+import asyncio
+import json
+import os
+import signal
+import sys
+from srcs.service import solve_equation
+
+
+USAGE = "Usage: python server.py [--tcp HOST:PORT | --unix PATH]"
+
+
+def handle_line(line: bytes) -> dict:
+    try:
+        request = json.loads(line)
+        if not isinstance(request, dict) or not isinstance(request.get("equation"), str):
+            raise ValueError("expected an object with an \"equation\" string")
+    except ValueError as e:
+        return {"error": f"Bad request: {str(e)}"}
+
+    response = solve_equation(request["equation"],
+                              steps=bool(request.get("steps", True)),
+                              verify=bool(request.get("verify", False)))
+    if "id" in request:
+        response["id"] = request["id"]
+    return response
+
+
+async def handle_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                # Line longer than the stream limit, the framing is lost
+                writer.write(b'{"error": "Bad request: line too long"}\n')
+                break
+            if not line:
+                break
+            if not line.strip():
+                continue
+            try:
+                # Solved in a worker thread, so a slow request does not stall
+                # the other connections
+                response = json.dumps(await loop.run_in_executor(None, handle_line, line))
+            except Exception as e:
+                # One bad request must not drop the other requests of the connection
+                response = json.dumps({"error": f"Error Check your input: {str(e)}"})
+            writer.write(response.encode() + b"\n")
+            await writer.drain()
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def serve(address: str, value: str):
+    if address == "--unix":
+        server = await asyncio.start_unix_server(handle_client, path=value)
+    else:
+        host, _, port = value.rpartition(":")
+        server = await asyncio.start_server(handle_client, host or "127.0.0.1", int(port))
+    names = ", ".join(str(sock.getsockname()) for sock in server.sockets)
+    print(f"computorv1 service listening on {names}")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+    async with server:
+        await stop.wait()
+    print("Service stopped")
+
+
+def main():
+    args = sys.argv[1:] or ["--tcp", "127.0.0.1:4242"]
+    if len(args) != 2 or args[0] not in ("--tcp", "--unix"):
+        print(USAGE)
+        sys.exit(1)
+    try:
+        asyncio.run(serve(*args))
+    finally:
+        if args[0] == "--unix" and os.path.exists(args[1]):
+            os.unlink(args[1])
+
+if __name__ == "__main__":
+    main()
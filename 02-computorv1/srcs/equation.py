@@ -1,24 +1,24 @@
+from typing import Optional
 from .parser import PolynomialParser
 from .polynomial import Polynomial
+from .exceptions import DegreeError
 
 class Equation:
-    def __init__(self, equation_str: str):
+    def __init__(self, equation_str: str, exact: bool = True, max_degree: Optional[int] = None):
         self.equation_str = equation_str
+        self.exact = exact
+        self.max_degree = max_degree  # Largest exponent accepted, None for any
         self.polynomial = self._parse_equation()
 
     def _parse_equation(self) -> Polynomial:
         """Parse equation string into a Polynomial"""
         left, right = self.equation_str.split('=')
         
-        # Parse both sides
-        left_coeffs = PolynomialParser.parse_expression(left)
-        right_coeffs = PolynomialParser.parse_expression(right)
-        
-        # Subtract right side coefficients from left side
-        coefficients = {}
-        for deg, coef in left_coeffs.items():
-            coefficients[deg] = coefficients.get(deg, 0) + coef
-        for deg, coef in right_coeffs.items():
+        # Parse both sides and move everything to the left: left - right = 0,
+        # still sparse so the degree is known before the polynomial is built
+        coefficients = PolynomialParser.parse_expression(left, self.exact)
+        for deg, coef in PolynomialParser.parse_expression(right, self.exact).items():
             coefficients[deg] = coefficients.get(deg, 0) - coef
-            
-        return Polynomial(coefficients)
\ No newline at end of file
+        if self.max_degree is not None and coefficients and max(coefficients) > self.max_degree:
+            raise DegreeError(f"The exponent {max(coefficients)} is above the largest accepted, {self.max_degree}.")
+        return Polynomial(coefficients, self.exact)
\ No newline at end of file
@@ -1,8 +1,22 @@
 from math import gcd
 from typing import Union
 import math
+import operator
+import re
+import sys
+
+_HASH_MODULUS = sys.hash_info.modulus
+_HASH_INF = sys.hash_info.inf
+
+_DECIMAL_RE = re.compile(r'^([+-]?)(\d*)(?:\.(\d*))?(?:[eE]([+-]?\d+))?$')
+# Largest power of ten a decimal literal may scale by: well past the float
+# range, small enough that 10 ** exp and the printed digits stay cheap
+_MAX_EXPONENT = 1000
+
 
 class Fraction:
+    __slots__ = ('numerator', 'denominator')
+
     def __init__(self, numerator: int, denominator: int = 1):
         if denominator == 0:
             raise ValueError("Denominator cannot be zero")
@@ -10,38 +24,71 @@ class Fraction:
         self.denominator = denominator
         self._reduce()
 
+    @classmethod
+    def _from_reduced(cls, numerator: int, denominator: int) -> 'Fraction':
+        """Build a fraction already in lowest terms, skipping normalization"""
+        obj = object.__new__(cls)
+        obj.numerator = numerator
+        obj.denominator = denominator
+        return obj
+
     def _reduce(self):
         """Reduce fraction to lowest terms"""
         if self.numerator == 0:
             self.denominator = 1
             return
-            
+
         # Handle signs
         if self.denominator < 0:
             self.numerator = -self.numerator
             self.denominator = -self.denominator
-            
+
+        if self.denominator == 1:
+            return
+
         # Reduce
-        d = gcd(abs(self.numerator), abs(self.denominator))
-        self.numerator //= d
-        self.denominator //= d
+        d = gcd(self.numerator, self.denominator)
+        if d != 1:
+            self.numerator //= d
+            self.denominator //= d
+
+    @staticmethod
+    def from_decimal(text: str) -> 'Fraction':
+        """Parse a decimal literal such as '-9.3' or '1e-3' exactly"""
+        match = _DECIMAL_RE.match(text.strip())
+        if not match:
+            raise ValueError(f"could not convert string to fraction: {text!r}")
+        sign, int_part, frac_part, exponent = match.groups()
+        frac_part = frac_part or ''
+        if not int_part and not frac_part:
+            raise ValueError(f"could not convert string to fraction: {text!r}")
+
+        numerator = int((int_part or '0') + frac_part)
+        exp = (int(exponent) if exponent else 0) - len(frac_part)
+        if abs(exp) > _MAX_EXPONENT:
+            raise ValueError(f"exponent out of range: {text!r}")
+        if sign == '-':
+            numerator = -numerator
+        if exp >= 0:
+            return Fraction._from_reduced(numerator * 10 ** exp, 1)
+        return Fraction(numerator, 10 ** -exp)
 
     @staticmethod
     def from_float(value: float, tolerance: float = 1.0E-10) -> 'Fraction':
         """Convert a float to a fraction"""
         if not isinstance(value, (int, float)):
             raise TypeError(f"Expected int or float, got {type(value)}")
-            
+
         if math.isnan(value) or math.isinf(value):
             raise ValueError("Cannot convert NaN or infinity to fraction")
 
         sign = 1 if value >= 0 else -1
         value = abs(value)
-            
+
         # Handle simple cases
         if abs(value - round(value)) < tolerance:
             return Fraction(int(sign * round(value)), 1)
-            
+
         # Continued fraction algorithm
         h = [0, 1]
         k = [1, 0]
@@ -49,30 +96,140 @@ class Fraction:
         value = value - a
         h.append(a)
         k.append(1)
-        
+
         for i in range(100):  # Limit iterations
             if value == 0 or abs(h[-1]/k[-1] - (value + a)) < tolerance:
                 return Fraction(sign * h[-1], k[-1])
-                
+
             value = 1.0 / value
             a = math.floor(value)
             value = value - a
             h.append(a * h[-1] + h[-2])
             k.append(a * k[-1] + k[-2])
-        
+
         # If no good fraction found, return closest
         return Fraction(sign * h[-1], k[-1])
 
+    @staticmethod
+    def _coerce(other) -> Union['Fraction', None]:
+        """Return other as a Fraction if it can be combined exactly"""
+        if isinstance(other, Fraction):
+            return other
+        if isinstance(other, int):
+            return Fraction._from_reduced(other, 1)
+        return None
+
+    def __add__(self, other):
+        o = Fraction._coerce(other)
+        if o is None:
+            return float(self) + other if isinstance(other, float) else NotImplemented
+        if self.denominator == o.denominator:
+            return Fraction(self.numerator + o.numerator, self.denominator)
+        return Fraction(self.numerator * o.denominator + o.numerator * self.denominator,
+                        self.denominator * o.denominator)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        o = Fraction._coerce(other)
+        if o is None:
+            return float(self) - other if isinstance(other, float) else NotImplemented
+        return self + (-o)
+
+    def __rsub__(self, other):
+        o = Fraction._coerce(other)
+        if o is None:
+            return other - float(self) if isinstance(other, float) else NotImplemented
+        return o + (-self)
+
+    def __mul__(self, other):
+        o = Fraction._coerce(other)
+        if o is None:
+            return float(self) * other if isinstance(other, float) else NotImplemented
+        return Fraction(self.numerator * o.numerator, self.denominator * o.denominator)
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        o = Fraction._coerce(other)
+        if o is None:
+            return float(self) / other if isinstance(other, float) else NotImplemented
+        if o.numerator == 0:
+            raise ZeroDivisionError("Fraction division by zero")
+        return Fraction(self.numerator * o.denominator, self.denominator * o.numerator)
+
+    def __rtruediv__(self, other):
+        o = Fraction._coerce(other)
+        if o is None:
+            return other / float(self) if isinstance(other, float) else NotImplemented
+        return o / self
+
+    def __neg__(self) -> 'Fraction':
+        return Fraction._from_reduced(-self.numerator, self.denominator)
+
+    def __pos__(self) -> 'Fraction':
+        return self
+
+    def __abs__(self) -> 'Fraction':
+        return Fraction._from_reduced(abs(self.numerator), self.denominator)
+
+    def __bool__(self) -> bool:
+        return self.numerator != 0
+
+    def _compare(self, other, op):
+        """Compare exactly against ints, fractions and finite floats"""
+        if isinstance(other, float):
+            if math.isnan(other) or math.isinf(other):
+                return op(0.0, other)
+            other = Fraction(*other.as_integer_ratio())
+        o = Fraction._coerce(other)
+        if o is None:
+            return NotImplemented
+        return op(self.numerator * o.denominator, o.numerator * self.denominator)
+
+    def __eq__(self, other):
+        return self._compare(other, operator.eq)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+    def __hash__(self) -> int:
+        """Hash compatible with int and float for equal values"""
+        try:
+            dinv = pow(self.denominator, -1, _HASH_MODULUS)
+        except ValueError:
+            hash_ = _HASH_INF
+        else:
+            hash_ = hash(hash(abs(self.numerator)) * dinv)
+        result = hash_ if self.numerator >= 0 else -hash_
+        return -2 if result == -1 else result
+
     def __float__(self) -> float:
-        """Convert fraction to float"""
-        return self.numerator / self.denominator
+        """Convert fraction to float, infinite past the float range"""
+        try:
+            return self.numerator / self.denominator
+        except OverflowError:
+            return math.inf if self.numerator > 0 else -math.inf
+
+    def __format__(self, spec: str) -> str:
+        """Plain f-strings keep the fraction form, format specs apply to the float value"""
+        return format(float(self), spec) if spec else str(self)
 
     def __str__(self) -> str:
         """Convert fraction to string"""
         if self.denominator == 1:
             return str(self.numerator)
         return f"""{self.numerator}/{self.denominator} 
-                    --> {self.numerator/self.denominator}"""
+                    --> {float(self)}"""
 
     def __repr__(self) -> str:
-        return str(self)
\ No newline at end of file
+        return str(self)
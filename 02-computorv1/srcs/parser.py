@@ -1,7 +1,10 @@
 # src/parser.py
 import re
-from typing import Dict, Tuple
+from typing import Dict, Tuple, Union
 from .exceptions import ParseError, DegreeError
+from .fraction import Fraction
+
+Number = Union[float, Fraction]
 
 
 class PolynomialParser:
@@ -20,8 +23,12 @@ class PolynomialParser:
         return expr
 
     @classmethod
-    def parse_expression(cls, expr: str) -> Dict[int, float]:
-        """Parse a full expression into coefficient dictionary"""
+    def parse_expression(cls, expr: str, exact: bool = False) -> Dict[int, Number]:
+        """Parse a full expression into coefficient dictionary.
+
+        With exact=True decimal coefficients are parsed straight into
+        Fraction instead of float, so no precision is lost.
+        """
         expr = cls.normalize_input(expr)
         coefficients = {}
         
@@ -44,7 +51,7 @@ class PolynomialParser:
         for term in terms:
             if term.strip():
                 try:
-                    coef, deg = cls.parse_term(term)
+                    coef, deg = cls.parse_term(term, exact)
                     coefficients[deg] = coefficients.get(deg, 0) + coef
                 except ValueError as e:
                     raise ParseError(f"Invalid term: {term}. Error: {str(e)}")
@@ -52,7 +59,7 @@ class PolynomialParser:
         return coefficients
 
     @classmethod
-    def parse_term(cls, term: str) -> Tuple[float, int]:
+    def parse_term(cls, term: str, exact: bool = False) -> Tuple[Number, int]:
         """Parse a single term into coefficient and degree"""
         term = term.strip()
         if not term:
@@ -70,11 +77,11 @@ class PolynomialParser:
             coefficient = 1 if not parts[0] or parts[0] == '+' else -1
         else:
             try:
-                coefficient = float(parts[0])
+                coefficient = Fraction.from_decimal(parts[0]) if exact else float(parts[0])
             except ValueError:
                 if parts[0].startswith("X") or parts[0].startswith("+X"): 
                     coefficient = 1
-                elif parts[0] == '-X':
+                elif parts[0].startswith("-X"):
                     coefficient = -1
                 else:
                     raise ParseError(f"Invalid coefficient: {parts[0]}")
@@ -1,40 +1,195 @@
-from typing import Dict, Union, List, Tuple
+from typing import Dict, Union, List, Tuple, Optional, Sequence
 import math
 from .fraction import Fraction
 from .exceptions import DegreeError
 
+try:
+    import numpy as np
+except ImportError:  # computorv1 itself runs without numpy
+    np = None
+
+Number = Union[float, Fraction]
+
+# Past this degree only the terms present are stored: such a polynomial has
+# its degree and reduced form, but no arithmetic, and solve() rejects it
+MAX_DENSE_DEGREE = 1 << 16
+
+
+def _display(value: Number) -> Number:
+    """Show exact coefficients the same way the float path prints them"""
+    if isinstance(value, Fraction):
+        return float(value) if value else 0
+    return value
+
+
+def _exact_sqrt(value: Fraction) -> Optional[Fraction]:
+    """Square root of a non-negative fraction, or None if it is irrational"""
+    num = math.isqrt(value.numerator)
+    den = math.isqrt(value.denominator)
+    if num * num == value.numerator and den * den == value.denominator:
+        return Fraction(num, den)
+    return None
+
+def _to_fraction(value: Number) -> Fraction:
+    """Exact value of an int, float or Fraction coefficient"""
+    if isinstance(value, Fraction):
+        return value
+    if isinstance(value, float):
+        return Fraction(*value.as_integer_ratio())
+    return Fraction(value)
+
+
 class Polynomial:
-    def __init__(self, coefficients: Dict[int, float]):
-        self.coefficients = {k: v for k, v in coefficients.items() if abs(v) > 1e-10}
-        if not self.coefficients:
-            self.coefficients[0] = 0
-        self.degree = max(self.coefficients.keys()) if self.coefficients else 0
-        self.steps = []  # Store solution steps
+    """Dense polynomial: coefficients[i] is the coefficient of X^i.
+
+    A polynomial of degree above MAX_DENSE_DEGREE keeps its non-zero terms
+    as sorted (degree, coefficient) pairs in terms, coefficients being None.
+    """
+
+    __slots__ = ('coefficients', 'terms', 'degree', 'exact', 'steps', 'residual')
+
+    def __init__(self, coefficients: Union[Dict[int, Number], Sequence[Number]], exact: bool = False):
+        self.exact = exact
+        self.steps = None  # Only allocated when solve(steps=True)
+        self.residual = None  # Only computed when solve(verify=True)
+        self.terms = None
+
+        if isinstance(coefficients, dict):
+            # The degree comes from the terms present, before any allocation
+            coefficients = {deg: _to_fraction(coef) if exact else coef
+                            for deg, coef in coefficients.items()
+                            if (coef != 0 if exact else abs(coef) > 1e-10)}
+            degree = max(coefficients, default=0)
+            if degree > MAX_DENSE_DEGREE:
+                self.coefficients = None
+                self.terms = sorted(coefficients.items())
+                self.degree = degree
+                return
+            dense = [0] * (degree + 1)
+            for deg, coef in coefficients.items():
+                dense[deg] = coef
+        else:
+            dense = list(coefficients) or [0]
+
+        if exact:
+            dense = [_to_fraction(c) for c in dense]
+        else:
+            dense = [0 if abs(c) <= 1e-10 else c for c in dense]
+
+        # Trim leading zero terms so the degree is the real one
+        while len(dense) > 1 and not dense[-1]:
+            dense.pop()
+        self.coefficients = dense
+        self.degree = len(dense) - 1
+
+    def coefficient(self, degree: int) -> Number:
+        """Coefficient of X^degree, zero past the degree"""
+        if self.coefficients is None:
+            return dict(self.terms).get(degree, 0)
+        return self.coefficients[degree] if degree <= self.degree else 0
+
+    def _dense(self) -> List[Number]:
+        """Dense coefficients, which a sparse high-degree polynomial does not have"""
+        if self.coefficients is None:
+            raise DegreeError(f"The polynomial degree {self.degree} is too high for arithmetic.")
+        return self.coefficients
+
+    def _wrap(self, coefficients: List[Number], other=None) -> 'Polynomial':
+        """Build a result that stays exact only if both operands were"""
+        if isinstance(other, Polynomial):
+            exact = self.exact and other.exact
+        else:
+            exact = self.exact and (other is None or isinstance(other, (int, Fraction)))
+        return Polynomial(coefficients, exact)
+
+    def __add__(self, other: Union['Polynomial', Number]) -> 'Polynomial':
+        a = self._dense()
+        if not isinstance(other, Polynomial):
+            return self._wrap([a[0] + other] + a[1:], other)
+        b = other._dense()
+        if len(a) < len(b):
+            a, b = b, a
+        return self._wrap([x + y for x, y in zip(a, b)] + a[len(b):], other)
+
+    __radd__ = __add__
+
+    def __neg__(self) -> 'Polynomial':
+        return self._wrap([-c for c in self._dense()])
+
+    def __sub__(self, other: Union['Polynomial', Number]) -> 'Polynomial':
+        return self + (-other)
+
+    def __rsub__(self, other: Number) -> 'Polynomial':
+        return (-self) + other
+
+    def __mul__(self, other: Union['Polynomial', Number]) -> 'Polynomial':
+        if not isinstance(other, Polynomial):
+            return self._wrap([c * other for c in self._dense()], other)
+        a, b = self._dense(), other._dense()
+        product = [0] * (len(a) + len(b) - 1)
+        for i, x in enumerate(a):
+            if not x:
+                continue
+            for j, y in enumerate(b):
+                product[i + j] += x * y
+        return self._wrap(product, other)
+
+    __rmul__ = __mul__
+
+    def evaluate(self, x):
+        """Evaluate at x with Horner's method.
+
+        x may be a number, a Fraction, or a NumPy array; arrays are evaluated
+        as float64 in place, so millions of points cost one output buffer.
+        Lists and tuples are evaluated point by point.
+        """
+        if np is not None and isinstance(x, np.ndarray):
+            return self._evaluate_array(x)
+        if isinstance(x, (list, tuple)):
+            return [self.evaluate(v) for v in x]
+        coefficients = self._dense()
+        result = x * 0 + coefficients[-1]
+        for coef in reversed(coefficients[:-1]):
+            result = result * x + coef
+        return result
+
+    def _evaluate_array(self, x):
+        x = np.asarray(x, dtype=np.float64)
+        coefficients = [float(c) for c in self._dense()]
+        result = np.full(x.shape, coefficients[-1])
+        for coef in reversed(coefficients[:-1]):
+            result *= x
+            result += coef
+        return result
+
+    __call__ = evaluate
+
+    def derivative(self) -> 'Polynomial':
+        """First derivative of the polynomial"""
+        if self.degree == 0:
+            return self._wrap([0])
+        return self._wrap([i * c for i, c in enumerate(self._dense()) if i])
 
     def __str__(self) -> str:
         """Convert polynomial to string representation"""
-        if not self.coefficients:
-            return "0"
-            
         terms = []
-        for degree in sorted(self.coefficients.keys()):
-            coef = self.coefficients[degree]
+        for degree, coef in self.terms or enumerate(self.coefficients):
             if abs(coef) < 1e-10:
                 continue
-            
+
             # Add plus sign for positive coefficients after first term
             if coef > 0 and terms:
                 terms.append("+ ")
             elif coef < 0:
                 terms.append("- ")
                 coef = abs(coef)
-            
+
             # Format coefficient
             if abs(abs(coef) - 1.0) < 1e-10 and degree != 0:
                 coef_str = ""
             else:
                 coef_str = f"{coef:.1f}"
-                
+
             # Format term
             if degree == 0:
                 term = f"{coef_str}"
@@ -42,98 +197,110 @@ class Polynomial:
                 term = f"{coef_str}X" if coef_str else "X"
             else:
                 term = f"{coef_str}X^{degree}" if coef_str else f"X^{degree}"
-            
+
             terms.append(term)
-            
+
         return " ".join(terms).strip()
 
-    def solve(self) -> Tuple[Union[str, List[Union[float, Fraction]]], List[str]]:
-        """Solve the polynomial equation and return both solution and steps"""
-        self.steps = []  # Reset steps
-        
+    def max_residual(self, roots: Sequence[Number]) -> float:
+        """Largest |P(x)| over the given roots, 0.0 for exact roots"""
+        return max((float(abs(self.evaluate(root))) for root in roots), default=0.0)
+
+    def _step(self, template: str, *args) -> None:
+        """Record a solution step, formatting it only when steps are wanted"""
+        if self.steps is not None:
+            self.steps.append(template.format(*args))
+
+    def solve(self, steps: bool = False, verify: bool = False) -> Tuple[Union[str, List[Union[float, Fraction]]], Optional[List[str]]]:
+        """Solve the polynomial equation and return both solution and steps.
+
+        Steps are only recorded with steps=True, otherwise None is returned
+        in their place. With verify=True the roots are plugged back in and
+        the max residual is stored in self.residual.
+        """
+        self.steps = [] if steps else None
+        self.residual = None
+
+        solution, _ = self._solve()
+        if verify and isinstance(solution, list):
+            self.residual = self.max_residual(solution)
+            self._step("Max residual |P(x)| = {:.3e}", self.residual)
+        return solution, self.steps
+
+    def _solve(self) -> Tuple[Union[str, List[Union[float, Fraction]]], Optional[List[str]]]:
         if self.degree > 2:
             raise DegreeError("The polynomial degree is strictly greater than 2, I can't solve.")
-            
+
         if self.degree == 0:
-            if abs(self.coefficients.get(0, 0)) < 1e-10:
-                self.steps.append("All coefficients are zero")
+            if self._is_zero(self.coefficients[0]):
+                self._step("All coefficients are zero")
                 return "All real numbers are solutions.", self.steps
-            self.steps.append(f"Constant equation: {self.coefficients[0]} = 0")
+            self._step("Constant equation: {} = 0", _display(self.coefficients[0]))
             return "No solution exists.", self.steps
-            
+
         if self.degree == 1:
             return self._solve_linear()
-            
+
         return self._solve_quadratic()
 
-    def _solve_linear(self) -> Tuple[List[Union[float, Fraction]], List[str]]:
+    def _is_zero(self, value: Number) -> bool:
+        """Exact zero test in exact mode, tolerance-based otherwise"""
+        return value == 0 if self.exact else abs(value) < 1e-10
+
+    def _root(self, name: str, value: Number, recover: bool = True) -> Union[float, Fraction]:
+        """Record a root in the steps, recovering a fraction from floats"""
+        if isinstance(value, Fraction):
+            self._step("{} = {}", name, value)
+            return value
+
+        if not recover:
+            self._step("{} ≈ {:.6f}", name, value)
+            return value
+
+        fraction = Fraction.from_float(value)
+        if abs(float(fraction) - value) < 1e-10:
+            self._step("{} = {}", name, fraction)
+            return fraction
+        self._step("{} ≈ {:.6f}", name, value)
+        return value
+
+    def _solve_linear(self) -> Tuple[List[Union[float, Fraction]], Optional[List[str]]]:
         """Solve linear equation ax + b = 0"""
-        a = self.coefficients.get(1, 0)
-        b = self.coefficients.get(0, 0)
-        
-        self.steps.append(f"Linear equation: {a}x + {b} = 0")
-        self.steps.append(f"x = -{b} / {a}")
-        
-        solution = -b / a
-        fraction = Fraction.from_float(solution)
-        
-        if abs(float(fraction) - solution) < 1e-10:
-            self.steps.append(f"x = {fraction}")
-            return [fraction], self.steps
-        else:
-            self.steps.append(f"x ≈ {solution:.6f}")
-            return [solution], self.steps
+        b, a = self.coefficients
+
+        self._step("Linear equation: {}x + {} = 0", _display(a), _display(b))
+        self._step("x = -{} / {}", _display(b), _display(a))
 
-    def _solve_quadratic(self) -> Tuple[Union[List[Union[float, Fraction]], str], List[str]]:
+        return [self._root("x", -b / a)], self.steps
+
+    def _solve_quadratic(self) -> Tuple[Union[List[Union[float, Fraction]], str], Optional[List[str]]]:
         """Solve quadratic equation ax² + bx + c = 0"""
-        a = self.coefficients.get(2, 0)
-        b = self.coefficients.get(1, 0)
-        c = self.coefficients.get(0, 0)
-        
-        self.steps.append(f"Quadratic equation: {a}x² + {b}x + {c} = 0")
-        
+        c, b, a = self.coefficients
+
+        self._step("Quadratic equation: {}x² + {}x + {} = 0", _display(a), _display(b), _display(c))
+
         discriminant = b*b - 4*a*c
-        self.steps.append(f"Discriminant = b² - 4ac = {b}² - 4({a})({c}) = {discriminant}")
-        
-        if abs(discriminant) < 1e-10:
-            solution = -b/(2*a)
-            self.steps.append("Discriminant is zero - one double root")
-            self.steps.append(f"x = -b/(2a) = -{b}/(2*{a})")
-            
-            fraction = Fraction.from_float(solution)
-            if abs(float(fraction) - solution) < 1e-10:
-                self.steps.append(f"x = {fraction}")
-                return [fraction], self.steps
-            else:
-                self.steps.append(f"x ≈ {solution:.6f}")
-                return [solution], self.steps
-                
+        self._step("Discriminant = b² - 4ac = {}² - 4({})({}) = {}",
+                   _display(b), _display(a), _display(c),
+                   float(discriminant) if self.exact else discriminant)
+
+        if self._is_zero(discriminant):
+            self._step("Discriminant is zero - one double root")
+            self._step("x = -b/(2a) = -{}/(2*{})", _display(b), _display(a))
+            return [self._root("x", -b/(2*a))], self.steps
+
         elif discriminant > 0:
-            self.steps.append("Discriminant is positive - two real roots")
-            sqrt_disc = math.sqrt(discriminant)
-            
+            self._step("Discriminant is positive - two real roots")
+            sqrt_disc = _exact_sqrt(discriminant) if self.exact else None
+            if sqrt_disc is None:
+                sqrt_disc = math.sqrt(discriminant)
+                a, b = float(a), float(b)
+
             sol1 = (-b + sqrt_disc)/(2*a)
             sol2 = (-b - sqrt_disc)/(2*a)
-            
-            frac1 = Fraction.from_float(sol1)
-            frac2 = Fraction.from_float(sol2)
-            
-            solutions = []
-            if abs(float(frac1) - sol1) < 1e-10:
-                self.steps.append(f"x₁ = {frac1}")
-                solutions.append(frac1)
-            else:
-                self.steps.append(f"x₁ ≈ {sol1:.6f}")
-                solutions.append(sol1)
-                
-            if abs(float(frac2) - sol2) < 1e-10:
-                self.steps.append(f"x₂ = {frac2}")
-                solutions.append(frac2)
-            else:
-                self.steps.append(f"x₂ ≈ {sol2:.6f}")
-                solutions.append(sol2)
-                
-            return solutions, self.steps
+            # Irrational exact roots must not be passed off as a fraction
+            recover = not self.exact
+            return [self._root("x₁", sol1, recover), self._root("x₂", sol2, recover)], self.steps
         else:
-            self.steps.append("Discriminant is negative - no real solutions")
+            self._step("Discriminant is negative - no real solutions")
             return "No real solutions exist (discriminant is negative).", self.steps
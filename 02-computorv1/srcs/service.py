@@ -0,0 +1,51 @@
+from typing import Any, Dict
+from .equation import Equation
+from .exceptions import ParseError, DegreeError
+from .fraction import Fraction
+
+
+# Largest exponent the service accepts, so no request builds a big polynomial
+MAX_DEGREE = 1000
+
+
+def format_root(root) -> str:
+    """Single-line root, for batch and service output"""
+    if isinstance(root, Fraction) and root.denominator != 1:
+        return f"{root.numerator}/{root.denominator}"
+    return str(root)
+
+
+def solve_equation(equation_str: str, steps: bool = True, verify: bool = False) -> Dict[str, Any]:
+    """Solve an equation and return what main() prints as a JSON-ready dict"""
+    try:
+        return _solve(equation_str, steps, verify)
+    except ParseError as e:
+        return {"error": f"Parse error: {str(e)}"}
+    except DegreeError as e:
+        return {"error": str(e)}
+    except Exception as e:
+        return {"error": f"Error Check your input: {str(e)}"}
+
+
+def _solve(equation_str: str, steps: bool, verify: bool) -> Dict[str, Any]:
+    polynomial = Equation(equation_str, max_degree=MAX_DEGREE).polynomial
+    result: Dict[str, Any] = {
+        "reduced_form": f"{polynomial} = 0",
+        "degree": polynomial.degree,
+    }
+    try:
+        solution, solution_steps = polynomial.solve(steps=steps, verify=verify)
+    except DegreeError as e:
+        result["error"] = str(e)
+        return result
+
+    if steps:
+        result["steps"] = solution_steps
+    if isinstance(solution, list):
+        result["solutions"] = [format_root(root) for root in solution]
+        result["values"] = [float(root) for root in solution]
+    else:
+        result["message"] = solution
+    if polynomial.residual is not None:
+        result["residual"] = polynomial.residual
+    return result